@@ -0,0 +1,144 @@
+"""
+Benchmarks for the drawing and rendering hot paths.
+
+Runs headless (frames are rendered into memory, never to a terminal), so it works in CI and over ssh without a tty.
+Every case is timed at a few terminal sizes, and the results are written as JSON so runs of different versions can be compared:
+
+	python benchmarks/bench.py -o before.json
+	(change things)
+	python benchmarks/bench.py -o after.json --compare before.json
+"""
+
+import argparse, io, json, platform, sys, time, timeit
+from datetime import datetime, timezone
+from importlib.metadata import version, PackageNotFoundError
+from typing import Callable, Dict, List, Tuple
+import numpy as np
+from pixelterm import PixeltermFrame, OutputSink, Font
+
+SIZES: Dict[str, Tuple[int, int]] = {
+	"80x24": (80, 24),
+	"160x48": (160, 48),
+	"320x90": (320, 90),
+}
+""" Terminal sizes to run every case at, in character cells. Frames are half blocks, so they're twice as many pixels tall. """
+
+SEED = 0
+
+def render_case(frame: PixeltermFrame, prev: PixeltermFrame | None) -> Tuple[Callable[[], None], int]:
+	""" A render into memory, and how many bytes it writes. """
+	target = io.BytesIO()
+	sink = OutputSink(target)
+	def run():
+		target.seek(0)
+		target.truncate()
+		frame.render(prev, sink)
+	run()
+	return run, len(target.getvalue())
+
+def cases(cols: int, rows: int) -> Dict[str, Tuple[Callable[[], None], int | None]]:
+	""" Every case at one terminal size: name -> (function to time, bytes it writes, or None if it doesn't render). """
+	rng = np.random.default_rng(SEED)
+	width, height = cols, rows * 2
+	photo = lambda: rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+	prev = PixeltermFrame((width, height))
+	prev.pixels[:] = photo()
+
+	idle = prev.copy()
+
+	sparse = prev.copy()
+	for _ in range(8): # a few small sprites moved around, about 2% of the screen
+		x, y = rng.integers(0, width - 8), rng.integers(0, height - 4)
+		sparse[y:y + 4, x:x + 8] = tuple(rng.integers(0, 256, 3).tolist())
+
+	full = PixeltermFrame((width, height))
+	full.pixels[:] = photo()
+
+	canvas = PixeltermFrame((width, height))
+	image = rng.integers(0, 256, (height // 2, width // 2, 4), dtype=np.uint8) # half transparent, half opaque
+	image[..., 3] = np.where(image[..., 3] > 127, 255, image[..., 3])
+
+	chart = np.stack((np.linspace(0, width - 1, 64), rng.integers(0, height, 64)), axis=1).astype(int) # a line chart of 64 points
+
+	return {
+		"render_raw": render_case(prev, None),
+		"render idle": render_case(idle, prev),
+		"render sparse": render_case(sparse, prev),
+		"render full change": render_case(full, prev),
+		"add_image_from_pixels": (lambda: canvas.add_image_from_pixels(image, width // 4, height // 4), None),
+		"add_rect": (lambda: canvas.add_rect((200, 50, 50, 180), width // 8, height // 8, width // 2, height // 2, 2, (255, 255, 255)), None),
+		"add_large_text": (lambda: canvas.add_large_text(2, 2, Font.font1, "Hello, world!", color=(255, 255, 0)), None),
+		"add_line": (lambda: canvas.add_line((0, 0), (width - 1, height - 1), (0, 255, 0), 2), None),
+		"add_polyline": (lambda: canvas.add_polyline(chart, (0, 255, 255)), None),
+		"fill_with_gradient horizontal": (lambda: canvas.fill_with_gradient((255, 0, 0), (0, 0, 255)), None),
+		"fill_with_gradient vertical": (lambda: canvas.fill_with_gradient((255, 0, 0), (0, 0, 255), "vertical"), None),
+		"Font.assemble": (lambda: Font.font1.assemble("Hello, world!", (255, 255, 0)), None),
+	}
+
+def measure(function: Callable[[], None], repeat: int) -> Dict[str, float | int]:
+	""" Seconds per call: the best and the median of `repeat` timing runs, each long enough (~0.2s) to not be noise. """
+	timer = timeit.Timer(function)
+	number, _ = timer.autorange()
+	runs = [total / number for total in timer.repeat(repeat, number)]
+	return {"best": min(runs), "median": float(np.median(runs)), "calls": number * repeat}
+
+def run(sizes: List[str], repeat: int, only: str | None) -> List[dict]:
+	results = []
+	for size_name in sizes:
+		for name, (function, encoded_bytes) in cases(*SIZES[size_name]).items():
+			if only is not None and only not in name:
+				continue
+			result = {"name": name, "size": size_name, **measure(function, repeat), "bytes": encoded_bytes}
+			results.append(result)
+			print(f"{name:<32} {size_name:>8} {result['best'] * 1e3:10.3f} ms{'' if encoded_bytes is None else f' {encoded_bytes:>10} B'}", file=sys.stderr)
+	return results
+
+def metadata() -> dict:
+	try:
+		pixelterm_version = version("pixelterm")
+	except PackageNotFoundError:
+		pixelterm_version = None
+	return {
+		"pixelterm": pixelterm_version,
+		"python": platform.python_version(),
+		"numpy": np.__version__,
+		"platform": platform.platform(),
+		"processor": platform.processor(),
+		"date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+		"seed": SEED,
+	}
+
+def compare(results: List[dict], baseline_path: str) -> None:
+	""" Prints how much faster (< 1) or slower (> 1) every case got compared to an earlier run. """
+	with open(baseline_path) as f:
+		baseline = {(result["name"], result["size"]): result for result in json.load(f)["results"]}
+	print(f"\n{'':<32} {'':>8} {'time':>8} {'bytes':>8}   vs {baseline_path}", file=sys.stderr)
+	for result in results:
+		old = baseline.get((result["name"], result["size"]))
+		if old is None:
+			continue
+		time_ratio = result["best"] / old["best"]
+		byte_ratio = f"{result['bytes'] / old['bytes']:7.2f}x" if result["bytes"] and old["bytes"] else ""
+		print(f"{result['name']:<32} {result['size']:>8} {time_ratio:7.2f}x {byte_ratio:>8}", file=sys.stderr)
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument("-o", "--output", default="benchmark_results.json", help="where to write the JSON results (default: %(default)s)")
+	parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES), help="terminal sizes to run (default: all)")
+	parser.add_argument("--repeat", type=int, default=5, help="timing runs per case (default: %(default)s)")
+	parser.add_argument("--only", help="only run cases whose name contains this")
+	parser.add_argument("--compare", metavar="BASELINE", help="an earlier results file to compare against")
+	args = parser.parse_args()
+
+	start = time.perf_counter()
+	results = run(args.sizes, args.repeat, args.only)
+	with open(args.output, "w") as f:
+		json.dump({"meta": metadata(), "results": results}, f, indent=1)
+	print(f"\nwrote {len(results)} results to {args.output} in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+	if args.compare:
+		compare(results, args.compare)
+
+if __name__ == "__main__":
+	main()
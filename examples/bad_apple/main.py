@@ -1,6 +1,5 @@
 import traceback
-from time import time_ns
-from pixelterm import PixeltermFrame, hide_terminal_cursor, show_terminal_cursor
+from pixelterm import Renderer, FrameScheduler, hide_terminal_cursor, show_terminal_cursor
 from helpers.vid_to_np import get_bad_apple
 from helpers.audio import AudioHandler
 
@@ -12,30 +11,22 @@ def main():
     
     bad_apple = get_bad_apple()
     
+    # the renderer keeps track of what's on screen to optimize rendering, and reuses its frames.
+    # synchronized output makes the terminal show each frame all at once
+    renderer = Renderer(synchronized=True)
+
     audio_handler.begin_playing_song()
-    start_time = time_ns()
 
-    # always store the previous frame to optimize rendering
-    previous_frame: PixeltermFrame = None
-    while True:        
-        # calculate frame number based on time since start
-        frame_number = int((time_ns() - start_time) / (1e9 / FPS)) 
-        
-        # if the frame number is greater than the number of frames, break (video ended)
-        if frame_number >= len(bad_apple):
-            break
-        
-        # create a new frame
-        new_frame = PixeltermFrame()
+    # the scheduler sleeps until each frame is due, and skips frames if rendering falls behind the audio
+    for frame_number in FrameScheduler(FPS, max_frames=len(bad_apple)):
+        # get the frame to draw on (cleared to black after every present)
+        new_frame = renderer.frame
 
         # paste video onto it
         new_frame.add_image_from_pixels(bad_apple[frame_number], 0, 0)
 
-        # render the new frame, using the previous frame to optimize rendering
-        new_frame.render(previous_frame)
-        
-        # save the new frame so we can use it to optimize rendering of the next one
-        previous_frame = new_frame
+        # render the new frame, only drawing what changed since the last one
+        renderer.present()
     
 if __name__ == "__main__":
     try:
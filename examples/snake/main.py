@@ -1,4 +1,4 @@
-from pixelterm import PixeltermFrame, Font, term_width, term_height, hide_terminal_cursor, show_terminal_cursor
+from pixelterm import Renderer, ThreadedSink, Font, term_width, term_height, hide_terminal_cursor, show_terminal_cursor
 from snake import Snake
 from time import sleep
 from threading import Thread
@@ -10,7 +10,9 @@ class SnakeVars:
 	term = blessed.Terminal()
 	stop_game = False
 	stop_game_reason: str | None = None
-	prev_frame: PixeltermFrame = None
+	# back buffer starts as a copy of what's on screen. Frames are written on a separate thread so a slow
+	# terminal doesn't hold up drawing; if it falls behind, pending frames get merged into one write
+	renderer = Renderer(preserve=True, sink=ThreadedSink(policy="coalesce"))
 	snake = Snake(term_width(), term_height())
 
 def tick_thread():
@@ -37,7 +39,7 @@ def render_thread():
 
 	try:
 		while not SnakeVars.stop_game:
-			new_frame = PixeltermFrame()
+			new_frame = SnakeVars.renderer.frame
 
 			# fill the map background
 			new_frame.add_rect((178, 208, 136), 0, 0, SnakeVars.snake.board_x, SnakeVars.snake.board_y)
@@ -45,9 +47,8 @@ def render_thread():
 			# Draw the snake on the frame (see ./snake.py)
 			SnakeVars.snake.draw_on_frame(new_frame)
 
-			# Render the frame
-			new_frame.render(SnakeVars.prev_frame)
-			SnakeVars.prev_frame = new_frame
+			# Render the frame (only what changed since the last one gets drawn)
+			SnakeVars.renderer.present()
 
 	except:
 		SnakeVars.stop_game = True
@@ -84,14 +85,16 @@ if __name__ == "__main__":
 		show_terminal_cursor()
 		SnakeVars.stop_game = True
 		
-		# Draw a centered background rect behind the text
-		SnakeVars.prev_frame.add_rect((0, 0, 0), SnakeVars.prev_frame.width//2, SnakeVars.prev_frame.height//2, Font.font1.get_width_of(len(SnakeVars.stop_game_reason))+2, Font.font1.get_height()+2, anchor="center")
+		# Draw a centered background rect behind the text, on top of the last frame
+		frame = SnakeVars.renderer.frame
+		frame.add_rect((0, 0, 0), frame.width//2, frame.height//2, Font.font1.get_width_of(len(SnakeVars.stop_game_reason))+2, Font.font1.get_height()+2, anchor="center")
 		
 		# Draw status text
-		SnakeVars.prev_frame.add_large_text(SnakeVars.prev_frame.width//2, SnakeVars.prev_frame.height//2, Font.font1, SnakeVars.stop_game_reason, anchor="center")
+		frame.add_large_text(frame.width//2, frame.height//2, Font.font1, SnakeVars.stop_game_reason, anchor="center")
 
-		# Render frame to screen
-		SnakeVars.prev_frame.render()
+		# Render frame to screen, and wait for it to be written
+		SnakeVars.renderer.present()
+		SnakeVars.renderer.sink.close()
 
 		# print(f"\n\x1b[30mExited Snake Game - reason: {SnakeVars.stop_game_reason}\x1b[0m")
 	except:
@@ -100,8 +103,10 @@ if __name__ == "__main__":
 		SnakeVars.stop_game_reason = "error"
 
 		# Drawing status text to screen - same as in the try: block above
-		SnakeVars.prev_frame.add_rect((0, 0, 0), SnakeVars.prev_frame.width//2, SnakeVars.prev_frame.height//2, Font.font1.get_width_of(len(SnakeVars.stop_game_reason))+2, Font.font1.get_height()+2, anchor="center")
-		SnakeVars.prev_frame.add_large_text(SnakeVars.prev_frame.width//2, SnakeVars.prev_frame.height//2, Font.font1, SnakeVars.stop_game_reason, anchor="center")
-		SnakeVars.prev_frame.render()
+		frame = SnakeVars.renderer.frame
+		frame.add_rect((0, 0, 0), frame.width//2, frame.height//2, Font.font1.get_width_of(len(SnakeVars.stop_game_reason))+2, Font.font1.get_height()+2, anchor="center")
+		frame.add_large_text(frame.width//2, frame.height//2, Font.font1, SnakeVars.stop_game_reason, anchor="center")
+		SnakeVars.renderer.present()
+		SnakeVars.renderer.sink.close()
 
 		print(f"\x1b[31m\nMAIN THREAD EXCEPTION: {traceback.format_exc()}\x1b[0m")
\ No newline at end of file
@@ -1,6 +1,5 @@
 import traceback
-from time import time_ns
-from pixelterm import PixeltermFrame, Font, hide_terminal_cursor, show_terminal_cursor
+from pixelterm import Renderer, FrameScheduler, Font, hide_terminal_cursor, show_terminal_cursor
 from bouncy_square import BouncySquare
 from bouncy_text import BouncyText
 from helpers.vid_to_np import get_bad_apple
@@ -21,31 +20,23 @@ def main():
     
     bad_apple = get_bad_apple(FPS)
     
-    audio_handler.begin_playing_song()
-    start_time = time_ns()
-
-    # always store the previous frame to optimize rendering
-    previous_frame: PixeltermFrame = None
+    # the renderer keeps track of what's on screen to optimize rendering, and reuses its frames.
+    # every frame gets fully redrawn (gradient first), so there's no need to clear them.
+    # synchronized output makes the terminal show each frame all at once
+    renderer = Renderer(clear_color=None, synchronized=True)
     
     last_frame_that_updated_gradient = -1
     last_frame_that_updated_screensavers = -1
 
     current_red_amount = 255
     change_red_by = -5
-    last_rendered_frame_number = -1
-    while True:        
-        # calculate frame number based on time since start
-        frame_number = int((time_ns() - start_time) / (1e9 / FPS))
 
-        # skip all this if the frame is the exact same
-        if frame_number == last_rendered_frame_number: continue
-        
-        # if the frame number is greater than the number of frames, break (video ended)
-        if frame_number >= len(bad_apple):
-            break
-        
-        # create a new frame
-        new_frame = PixeltermFrame()
+    audio_handler.begin_playing_song()
+
+    # the scheduler sleeps until each frame is due, and skips frames if rendering falls behind the audio
+    for frame_number in FrameScheduler(FPS, max_frames=len(bad_apple)):
+        # get the frame to draw on
+        new_frame = renderer.frame
 
         # shenanigans below
         # change the gradient in the background slightly every 3 frames
@@ -82,12 +73,8 @@ def main():
         bouncy_text_background.draw_on_frame(new_frame)
         bouncy_text_1.draw_on_frame(new_frame)
 
-        # render the new frame, using the previous frame to optimize rendering
-        new_frame.render(previous_frame)
-        
-        # save the new frame so we can use it to optimize rendering of the next one
-        previous_frame = new_frame
-        last_rendered_frame_number = frame_number
+        # render the new frame, only drawing what changed since the last one
+        renderer.present()
 
 if __name__ == "__main__":
     try:
@@ -10,6 +10,13 @@ from .render_utils import (
 	blend_rgba_img_onto_rgb_img,
 )
 from .cursor_utils import *
+from .output import OutputSink, ThreadedSink
+from .color_cache import ColorCodeCache, color_codes
+from .virtual_terminal import VirtualTerminal
+from .renderer import Renderer
+from .scheduler import FrameScheduler, FrameReport
+from .stats import RenderStats, draw_stats_hud
+from .gradient import gradient_image, clear_gradient_cache
 
 import os as _os
 
@@ -0,0 +1,94 @@
+import numpy as np
+from itertools import combinations
+from typing import Dict, List, Tuple
+from .pixelterm_types import CellMode
+
+CELL_SHAPES: Dict[CellMode, Tuple[int, int]] = {
+    "half": (2, 1),
+    "quadrant": (2, 2),
+    "sextant": (3, 2),
+    "braille": (4, 2),
+}
+""" (height, width) in pixels of one character cell, for each cell mode. """
+
+def _sextants() -> List[str]:
+    # U+1FB00.. has every 2x3 pattern except the ones that already exist: empty, full, left half and right half
+    glyphs = []
+    for mask in range(64):
+        if mask in (0, 21, 42, 63):
+            glyphs.append({0: " ", 21: "▌", 42: "▐", 63: "█"}[mask])
+        else:
+            glyphs.append(chr(0x1FB00 + mask - 1 - (mask > 21) - (mask > 42)))
+    return glyphs
+
+def _braille() -> List[str]:
+    # braille numbers its dots down the left column first (1-3, then 4-6 on the right), with the bottom row (7, 8) added last
+    dot_bits = [0x01, 0x08, 0x02, 0x10, 0x04, 0x20, 0x40, 0x80]
+    glyphs = []
+    for mask in range(256):
+        dots = sum(bit for i, bit in enumerate(dot_bits) if mask >> i & 1)
+        glyphs.append(chr(0x2800 + dots) if dots else " ")
+    return glyphs
+
+CELL_GLYPHS: Dict[CellMode, List[str]] = {
+    "half": [" ", "▀", "▄", "█"],
+    "quadrant": list(" ▘▝▀▖▌▞▛▗▚▐▜▄▙▟█"),
+    "sextant": _sextants(),
+    "braille": _braille(),
+}
+"""
+The glyph for every pattern of a cell, indexed by a bitmask of which pixels are drawn in the fg color
+(bit `row * width + col`, so bit 0 is the top left pixel). Unset pixels show the bg color.
+"""
+
+SWAPPABLE: Dict[CellMode, bool] = {"half": True, "quadrant": True, "sextant": True, "braille": False}
+"""
+Whether the glyph of the inverted mask, with fg and bg swapped, looks the same as the original (and `█` as a space).
+Braille dots don't cover the whole cell, so there the bg always shows around them and colors can't be swapped.
+"""
+
+def fit_cells(pixels: np.ndarray, cell_mode: CellMode) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fits every cell of a (height, width, 3) rgb frame to two colors, all cells at once.
+
+    The two pixels of each cell that are furthest apart are taken as the two colors, every pixel joins the one
+    it's closer to, and each group is then colored with the average of its pixels. The smaller group is the fg.
+
+    Returns the fitted colors as a (rows * 2, cols, 3) array, laid out like a half block frame:
+    row `2r` holds the fg and row `2r + 1` the bg color of character row r (the same color twice if the cell is
+    a single color), and the (rows, cols) uint8 masks of the fg pixels (see `CELL_GLYPHS`).
+    """
+    cell_height, cell_width = CELL_SHAPES[cell_mode]
+    rows, cols = pixels.shape[0] // cell_height, pixels.shape[1] // cell_width
+    count = cell_height * cell_width
+
+    # (3, rows, cols, pixels per cell), pixels in reading order. Channels first, so that
+    # squared distances are 3 whole-array operations instead of a slow reduction over a tiny axis
+    cells = pixels.reshape(rows, cell_height, cols, cell_width, 3).transpose(4, 0, 2, 1, 3).reshape(3, rows, cols, count).astype(np.int32)
+    squared = lambda diff: diff[0] * diff[0] + diff[1] * diff[1] + diff[2] * diff[2]
+
+    # the pair of pixels with the largest distance, out of every pair in the cell
+    first, second = np.array(list(combinations(range(count), 2))).T
+    best = squared(cells[..., first] - cells[..., second]).argmax(axis=-1)[np.newaxis, ..., np.newaxis]
+    color1 = np.take_along_axis(cells, first[best], axis=-1)
+    color2 = np.take_along_axis(cells, second[best], axis=-1)
+
+    # pixels strictly closer to the second color form one group. Uniform cells have none
+    in_group = squared(cells - color2) < squared(cells - color1)
+    grouped = in_group.sum(axis=-1)
+    flip = grouped * 2 > count
+    in_group ^= flip[..., np.newaxis]
+    grouped = np.where(flip, count - grouped, grouped)
+
+    fg_sums = (cells * in_group).sum(axis=-1)
+    bg_sums = cells.sum(axis=-1) - fg_sums
+    fg_counts = np.maximum(grouped, 1)
+    bg_counts = count - grouped
+    bg = (bg_sums + bg_counts // 2) // bg_counts
+    fg = np.where(grouped > 0, (fg_sums + fg_counts // 2) // fg_counts, bg)
+
+    colors = np.empty((rows * 2, cols, 3), dtype=np.uint8)
+    colors[0::2] = np.moveaxis(fg, 0, -1)
+    colors[1::2] = np.moveaxis(bg, 0, -1)
+    masks = (in_group << np.arange(count, dtype=np.uint8)).sum(axis=-1, dtype=np.uint8)
+    return colors, masks
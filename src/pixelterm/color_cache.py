@@ -0,0 +1,79 @@
+import numpy as np
+from collections import OrderedDict
+from threading import Lock
+from typing import Tuple
+from .pixelterm_types import RGBTuple
+
+CODE_WIDTH = len(b"\033[38;2;255;255;255m")
+""" Length in bytes of the longest truecolor code. """
+
+def pack_colors(colors: np.ndarray) -> np.ndarray:
+    """ Packs (..., 3) rgb colors into (...) 24-bit integers, `0xRRGGBB`. """
+    return (colors[..., 0].astype(np.uint32) << 16) | (colors[..., 1].astype(np.uint32) << 8) | colors[..., 2]
+
+class ColorCodeCache:
+    """
+    Bounded cache of encoded truecolor escape codes (`\\033[38;2;r;g;bm` / `\\033[48;2;r;g;bm`), keyed by
+    the packed 24-bit color. Videos and games keep reusing a small set of colors, so most codes only ever get
+    formatted once. When it's full, the least recently used code is evicted.
+
+    `fcode` and the frame encoder (see `encoder._color_segments`) share the default instance, `color_codes`.
+    Lookups are locked, so frames can be encoded on several threads at once.
+    """
+
+    def __init__(self, max_size: int = 4096) -> None:
+        """ `max_size`: how many codes to keep (fg and bg codes count separately). """
+        assert max_size > 0, f"[ColorCodeCache/__init__]: max_size must be positive, instead got {max_size}"
+        self.max_size = max_size
+        self._codes: OrderedDict[int, bytes] = OrderedDict()
+        self._lock = Lock()
+
+        self.hits = 0
+        """ Number of lookups that found the code in the cache. """
+        self.misses = 0
+        """ Number of lookups that had to format the code. """
+        self.evictions = 0
+        """ Number of codes dropped to make room for new ones. """
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def clear(self) -> None:
+        """ Drops every cached code. The counters are kept. """
+        with self._lock:
+            self._codes.clear()
+
+    def _padded(self, packed: int, foreground: bool) -> bytes:
+        """ The code for one packed color, zero-padded to `CODE_WIDTH`. Callers hold `_lock`. """
+        key = packed | (foreground << 24)
+        code = self._codes.get(key)
+        if code is not None:
+            self.hits += 1
+            self._codes.move_to_end(key)
+            return code
+
+        self.misses += 1
+        code = f"\033[{38 if foreground else 48};2;{packed >> 16};{packed >> 8 & 255};{packed & 255}m".encode().ljust(CODE_WIDTH, b"\0")
+        self._codes[key] = code
+        if len(self._codes) > self.max_size:
+            self._codes.popitem(last=False)
+            self.evictions += 1
+        return code
+
+    def get(self, color: RGBTuple, foreground: bool = True) -> bytes:
+        """ The code that sets the fg (or bg) to an rgb `color`. """
+        with self._lock:
+            return self._padded((int(color[0]) << 16) | (int(color[1]) << 8) | int(color[2]), foreground).rstrip(b"\0")
+
+    def table(self, packed: np.ndarray, foreground: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Byte table of the codes for an array of distinct packed colors (see `pack_colors`), in the
+        layout the encoder gathers from: (`CODE_WIDTH`, n) zero-padded bytes, and the length of each code.
+        """
+        with self._lock: # once for the whole table, not per color
+            joined = b"".join([self._padded(color, foreground) for color in packed.tolist()])
+        table = np.frombuffer(joined, dtype=np.uint8).reshape(len(packed), CODE_WIDTH)
+        return np.ascontiguousarray(table.T), np.count_nonzero(table, axis=1)
+
+color_codes = ColorCodeCache()
+""" The cache used by `fcode` and when rendering frames. """
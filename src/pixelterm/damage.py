@@ -0,0 +1,73 @@
+import numpy as np
+from typing import List, Tuple
+
+Rect = Tuple[int, int, int, int]
+""" (left, top, right, bottom), with right and bottom exclusive. """
+
+MAX_DAMAGE_RECTS = 16
+""" Once a damage list grows past this, it's collapsed into its bounding box (diffing a bit more beats keeping track of lots of tiny rects). """
+
+MAX_BAND_GAP = 4
+""" Runs of changed rows closer together than this many unchanged rows are diffed as one band (see `row_bands`). """
+MAX_BANDS = 4
+""" If the changed rows still make up more bands than this, they're diffed as one. """
+
+def clip_rect(rect: Rect, width: int, height: int) -> Rect | None:
+    """ Clips `rect` to a (width, height) area. None if nothing is left. """
+    left, top, right, bottom = max(rect[0], 0), max(rect[1], 0), min(rect[2], width), min(rect[3], height)
+    return (left, top, right, bottom) if left < right and top < bottom else None
+
+def _touches(a: Rect, b: Rect) -> bool:
+    """ Whether two rects overlap or share an edge. """
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+def _union(a: Rect, b: Rect) -> Rect:
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+def add_damage(rects: List[Rect], rect: Rect) -> None:
+    """
+    Adds `rect` to a list of non-overlapping rects, in place. Rects it overlaps (or touches) are merged with it
+    into their bounding box, until it doesn't overlap anything anymore.
+    """
+    merged = True
+    while merged:
+        merged = False
+        for i, other in enumerate(rects):
+            if _touches(other, rect):
+                rect = _union(other, rect)
+                rects.pop(i)
+                merged = True
+                break
+    rects.append(rect)
+
+    if len(rects) > MAX_DAMAGE_RECTS:
+        bounds = rects[0]
+        for other in rects[1:]:
+            bounds = _union(bounds, other)
+        rects[:] = [bounds]
+
+def cell_rects(rects: List[Rect], cell_height: int, cell_width: int) -> List[Rect]:
+    """ Converts pixel rects to the (non-overlapping) rects of character cells they touch. """
+    cells: List[Rect] = []
+    for left, top, right, bottom in rects:
+        add_damage(cells, (left // cell_width, top // cell_height, -(-right // cell_width), -(-bottom // cell_height)))
+    return cells
+
+def row_bands(changed: np.ndarray, width: int) -> List[Rect]:
+    """
+    Groups a (rows,) mask of changed character rows into full `width` (left, top, right, bottom) bands of cells.
+
+    Every band is diffed and encoded on its own, which has a fixed cost, and restarts the color state. So runs of changed rows
+    less than `MAX_BAND_GAP` rows apart are joined, and if that still leaves more than `MAX_BANDS`, it all becomes one band.
+    """
+    edges = np.diff(np.concatenate(([0], changed.astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    if starts.size == 0:
+        return []
+
+    split = starts[1:] - ends[:-1] >= MAX_BAND_GAP
+    starts = np.concatenate((starts[:1], starts[1:][split]))
+    ends = np.concatenate((ends[:-1][split], ends[-1:]))
+    if starts.size > MAX_BANDS:
+        return [(0, int(starts[0]), width, int(ends[-1]))]
+    return [(0, int(start), width, int(end)) for start, end in zip(starts, ends)]
@@ -0,0 +1,444 @@
+import numpy as np
+from typing import Dict, Literal, Tuple
+from .blocks import CELL_GLYPHS, CELL_SHAPES, SWAPPABLE
+from .color_cache import color_codes, pack_colors
+from .palette import quantize
+from .pixelterm_types import CellMode, ColorMode
+
+PATTERN, INVERTED, SPACE, FULL = range(4)
+"""
+Glyph choices for a cell, see `encode_cells`: the cell's own pattern (`▀` in half block mode), the inverted
+pattern with fg and bg swapped (`▄`), a space (bg only) or `█` (fg only).
+"""
+
+def _byte_table(entries: list) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Packs a list of byte strings into a zero-padded uint8 table and an array of their lengths.
+    The table is stored transposed, (longest, n), so that gathering from it writes whole contiguous rows in `_assemble`.
+    """
+    width = max(len(entry) for entry in entries)
+    table = np.zeros((max(width, 1), len(entries)), dtype=np.uint8)
+    for i, entry in enumerate(entries):
+        table[:len(entry), i] = np.frombuffer(entry, dtype=np.uint8)
+    lengths = np.array([len(entry) for entry in entries], dtype=np.intp)
+    return table, lengths
+
+_number_tables: Dict[bytes, Tuple[np.ndarray, np.ndarray]] = {}
+""" Byte tables of `str(i) + suffix` for i in 0..n, keyed by suffix. """
+
+def _numbers(upto: int, suffix: bytes = b"") -> Tuple[np.ndarray, np.ndarray]:
+    """ Returns the byte table of decimal numbers followed by `suffix`, (re)building it if it doesn't cover `upto` yet. """
+    table = _number_tables.get(suffix)
+    if table is None or upto >= table[0].shape[1]:
+        # 0..999 covers every color component and (almost always) every cursor coordinate
+        size = max(upto + 1, 1000, 0 if table is None else 2 * table[0].shape[1])
+        table = _number_tables[suffix] = _byte_table([str(i).encode() + suffix for i in range(size)])
+    return table
+
+_glyph_tables: Dict[CellMode, Tuple[np.ndarray, np.ndarray]] = {}
+
+def _glyphs(cell_mode: CellMode) -> Tuple[np.ndarray, np.ndarray]:
+    """ Byte table of every glyph of `cell_mode`, indexed by pattern mask (see `blocks.CELL_GLYPHS`). """
+    if cell_mode not in _glyph_tables:
+        _glyph_tables[cell_mode] = _byte_table([glyph.encode() for glyph in CELL_GLYPHS[cell_mode]])
+    return _glyph_tables[cell_mode]
+
+def _cell_pos(pos: Tuple[int, int], cell_mode: CellMode) -> Tuple[int, int]:
+    """ Converts an (x, y) position in pixels to the 0-indexed terminal (col, row) of the cell it's in. """
+    cell_height, cell_width = CELL_SHAPES[cell_mode]
+    return pos[0] // cell_width, pos[1] // cell_height
+
+def _const(value: bytes, enabled: np.ndarray | None = None) -> tuple:
+    """ Segment that emits the same bytes for every entry (or only the entries where `enabled` is True). """
+    table, lengths = _byte_table([value])
+    return table, lengths, 0, enabled
+
+def _number(values: np.ndarray, enabled: np.ndarray | None = None, suffix: bytes = b"") -> tuple:
+    """ Segment that emits the decimal representation of each value, followed by `suffix`. """
+    table, lengths = _numbers(int(values.max()) if values.size else 0, suffix)
+    return table, lengths, values, enabled
+
+def _assemble(count: int, segments: list) -> bytes:
+    """
+    Builds `count` variable-length records, each made of the given segments in order, and concatenates them.
+
+    A segment is `(table, lengths, index, enabled)`: entry i of the segment is `table[:lengths[index[i]], index[i]]`,
+    or nothing if `enabled[i]` is False. `index` can be a scalar and `enabled` can be None (always on).
+
+    Everything is laid out in one padded (total_width, count) byte matrix and the padding is masked out,
+    so there is no per-record python work at all.
+    """
+    total_width = sum(segment[0].shape[0] for segment in segments)
+    out = np.empty((total_width, count), dtype=np.uint8)
+    keep = np.empty((total_width, count), dtype=bool)
+
+    offset = 0
+    for table, lengths, index, enabled in segments:
+        width = table.shape[0]
+        if np.ndim(index) == 0 and enabled is None:
+            # constant segment, no gathering needed
+            out[offset:offset+width] = table[:, index, np.newaxis]
+            keep[offset:offset+width] = (np.arange(width) < lengths[index])[:, np.newaxis]
+        else:
+            seg_lengths = np.broadcast_to(lengths[index], (count,))
+            if enabled is not None:
+                seg_lengths = np.where(enabled, seg_lengths, 0)
+            out[offset:offset+width] = table[:, index] if np.ndim(index) else table[:, index, np.newaxis]
+            keep[offset:offset+width] = np.arange(width)[:, np.newaxis] < seg_lengths
+        offset += width
+
+    # transposing back to one record per row puts the bytes in output order
+    return out.T[keep.T].tobytes()
+
+def frame_colors(pixels: np.ndarray, color_mode: ColorMode = "truecolor") -> np.ndarray:
+    """
+    Returns what actually gets sent to the terminal for each pixel: the (height, width, 3) rgb pixels themselves
+    in truecolor mode, or the (height, width) palette indices they quantize to in "256" and "16" color modes.
+
+    Every encoding function below takes these "colors" instead of raw pixels, so diffing also happens
+    on palette indices (pixels that quantize to the same palette entry never trigger a repaint).
+    """
+    return pixels if color_mode == "truecolor" else quantize(pixels, color_mode)
+
+_palette_code_tables: Dict[Tuple[ColorMode, bool], Tuple[np.ndarray, np.ndarray]] = {}
+
+def _palette_codes(color_mode: ColorMode, foreground: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """ Byte table of the fg or bg code for every palette index of the given mode. """
+    key = (color_mode, foreground)
+    if key not in _palette_code_tables:
+        if color_mode == "256":
+            codes = [f"\033[{38 if foreground else 48};5;{i}m".encode() for i in range(256)]
+        else: # 30-37/90-97 set the fg, 40-47/100-107 the bg
+            base = 30 if foreground else 40
+            codes = [f"\033[{base + i if i < 8 else base + 60 + i - 8}m".encode() for i in range(16)]
+        _palette_code_tables[key] = _byte_table(codes)
+    return _palette_code_tables[key]
+
+def _color_segments(colors: np.ndarray, foreground: bool, color_mode: ColorMode, enabled: np.ndarray | None = None) -> list:
+    """
+    Segments for the code that sets the fg (or bg) to each color in `colors`: (n, 3) rgb colors
+    in truecolor mode (`38;2;r;g;b`), or (n,) palette indices in the palette modes.
+
+    In truecolor mode, the codes of the distinct colors come from `color_cache.color_codes`, as long as
+    there are few enough of them to fit. Otherwise (noisy content), they're built from the digits of every channel.
+    """
+    if color_mode != "truecolor":
+        table, lengths = _palette_codes(color_mode, foreground)
+        return [(table, lengths, colors, enabled)]
+
+    packed = pack_colors(colors)
+    distinct, inverse = np.unique(packed if enabled is None else packed[enabled], return_inverse=True)
+    if distinct.size == 0:
+        return []
+    if distinct.size <= color_codes.max_size // 2:
+        table, lengths = color_codes.table(distinct, foreground)
+        if enabled is None:
+            return [(table, lengths, inverse, None)]
+        index = np.zeros(packed.size, dtype=np.intp)
+        index[enabled] = inverse
+        return [(table, lengths, index, enabled)]
+
+    return [
+        _const(b"\033[38;2;" if foreground else b"\033[48;2;", enabled),
+        _number(colors[:, 0], enabled, b";"),
+        _number(colors[:, 1], enabled, b";"),
+        _number(colors[:, 2], enabled, b"m"),
+    ]
+
+def _code_lengths(colors: np.ndarray, foreground: bool, color_mode: ColorMode) -> np.ndarray:
+    """ Length in bytes of the code `_color_segments` would emit for each color in `colors`. """
+    if color_mode != "truecolor":
+        return _palette_codes(color_mode, foreground)[1][colors]
+    digits = _numbers(255)[1]
+    # "\033[38;2;" + "r;g;b" + "m"
+    return 7 + digits[colors[..., 0]] + digits[colors[..., 1]] + digits[colors[..., 2]] + 3
+
+def _differs(a: np.ndarray, b: np.ndarray, color_mode: ColorMode) -> np.ndarray:
+    """ Elementwise "is a different color than", for rgb colors (truecolor, last axis = channels) or palette indices. """
+    if color_mode != "truecolor":
+        return a != b
+    # comparing channel by channel is a lot faster than .any() over the tiny last axis
+    return (a[..., 0] != b[..., 0]) | (a[..., 1] != b[..., 1]) | (a[..., 2] != b[..., 2])
+
+def _move_segments(rows: np.ndarray, cols: np.ndarray, enabled: np.ndarray | None = None) -> list:
+    """ Segments for the cursor move (see `move_xy`) to each 0-indexed terminal (row, col). """
+    return [
+        _const(b"\033[", enabled),
+        _number(rows + 1, enabled, b";"),
+        _number(cols + 1, enabled, b"H"),
+    ]
+
+def _split_cells(colors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Splits (height, width[, 3]) colors into the flattened top and bottom halves of every character cell.
+    For frames fitted with `blocks.fit_cells`, those are the fg and bg colors.
+    """
+    count = colors.shape[0] // 2 * colors.shape[1]
+    return colors[0::2].reshape(count, *colors.shape[2:]), colors[1::2].reshape(count, *colors.shape[2:])
+
+def encode_raw(
+    colors: np.ndarray, 
+    pos: Tuple[int, int] = (0, 0), 
+    color_mode: ColorMode = "truecolor", 
+    masks: np.ndarray | None = None, 
+    cell_mode: CellMode = "half"
+    ) -> bytes:
+    """
+    Encodes an entire frame (see `frame_colors`) into the escape codes that draw it, with the top left
+    pixel placed at `pos` (x, y in pixels, y even). Every character row starts with a cursor move.
+    This is `encode_cells` with every cell painted.
+    """
+    return encode_cells(colors, np.ones((colors.shape[0] // 2, colors.shape[1]), dtype=bool), pos, color_mode, masks, cell_mode)
+
+def color_distance(colors: np.ndarray, prev_colors: np.ndarray, metric: Literal["channel", "perceptual"] = "channel") -> np.ndarray:
+    """
+    Distance between two (..., 3) arrays of rgb colors, elementwise. Returns a (...) array.
+    - `"channel"`: the largest difference of any single channel (0-255).
+    - `"perceptual"`: "redmean" weighted euclidean distance, which tracks how different colors look a lot
+    better than plain rgb distance. Scaled so that shifting all three channels by d gives a distance of about d.
+    """
+    diff = colors.astype(np.int32) - prev_colors
+    if metric == "channel":
+        return np.abs(diff).max(axis=-1)
+    red_mean = (colors[..., 0].astype(np.int32) + prev_colors[..., 0]) // 2
+    weighted = (512 + red_mean) * diff[..., 0] ** 2 + 1024 * diff[..., 1] ** 2 + (767 - red_mean) * diff[..., 2] ** 2
+    return np.sqrt(weighted / (9 * 256))
+
+def changed_rows(pixels: np.ndarray, prev_pixels: np.ndarray, cell_height: int = 2) -> np.ndarray:
+    """
+    Returns the (rows,) mask of character rows (`cell_height` pixel rows each) where any pixel differs between the two frames.
+    Every character row is compared as one flat block, which is about as fast as `np.array_equal` on the whole frame.
+    """
+    rows = pixels.shape[0] // cell_height
+    return np.not_equal(pixels.reshape(rows, -1), prev_pixels.reshape(rows, -1)).any(axis=1)
+
+def dirty_cells(
+    colors: np.ndarray, 
+    prev_colors: np.ndarray, 
+    tolerance: float = 0, 
+    metric: Literal["channel", "perceptual"] = "channel"
+    ) -> np.ndarray:
+    """
+    Returns the (rows, cols) mask of character cells whose top or bottom pixel differs between
+    the two frames (rgb pixels or palette indices, see `frame_colors`), computed for the whole frame in one pass.
+
+    With a `tolerance` (rgb only), a pixel only counts as changed if its `color_distance` from the previous color
+    is greater than `tolerance`.
+    """
+    rows, cols = colors.shape[0] // 2, colors.shape[1]
+    if tolerance > 0 and colors.ndim == 3:
+        changed = (color_distance(colors, prev_colors, metric) > tolerance).reshape(rows, 2, cols)
+        return changed[:, 0] | changed[:, 1]
+
+    # (height, width, channels) -> (rows, 2, cols, channels): a cell is dirty if any of its 2 pixels x channels changed.
+    # OR-ing the slices together is a lot faster than .any() over non-contiguous axes
+    changed = np.not_equal(colors, prev_colors).reshape(rows, 2, cols, -1)
+    changed = changed[:, 0] | changed[:, 1]
+    dirty = changed[..., 0]
+    for channel in range(1, changed.shape[-1]):
+        dirty = dirty | changed[..., channel]
+    return dirty
+
+def fill_cheap_gaps(
+    colors: np.ndarray, 
+    dirty: np.ndarray, 
+    pos: Tuple[int, int] = (0, 0), 
+    color_mode: ColorMode = "truecolor", 
+    cell_mode: CellMode = "half"
+    ) -> np.ndarray:
+    """
+    Takes a (rows, cols) mask of the character cells that changed, and returns the mask of cells to repaint.
+
+    Each row is split into runs of dirty cells. The unchanged gap between two runs on the same row is either
+    skipped with a cursor move, or repainted if re-emitting its cells is estimated to take fewer bytes than the move.
+    The estimate assumes the gap is painted continuously after the run before it (glyph + any color codes
+    the state machine in `encode_cells` would have to emit).
+    """
+    rows, cols = dirty.shape
+    if rows == 0 or cols == 0:
+        return dirty.copy()
+
+    top = colors[0::2].astype(np.intp)
+    bottom = colors[1::2].astype(np.intp)
+
+    # bytes each cell would cost if its left neighbour was painted right before it
+    costs = np.full((rows, cols), _glyphs(cell_mode)[1].max(), dtype=np.intp)
+    costs[:, 1:] += np.where(_differs(top[:, 1:], top[:, :-1], color_mode), _code_lengths(top[:, 1:], True, color_mode), 0)
+    costs[:, 1:] += np.where(_differs(bottom[:, 1:], bottom[:, :-1], color_mode), _code_lengths(bottom[:, 1:], False, color_mode), 0)
+    cumulative = np.zeros((rows, cols + 1), dtype=np.intp)
+    np.cumsum(costs, axis=1, out=cumulative[:, 1:])
+
+    # run boundaries: +1 where a dirty run starts, -1 right after one ends
+    edges = np.diff(np.pad(dirty, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+    start_rows, start_cols = np.nonzero(edges == 1)
+    end_rows, end_cols = np.nonzero(edges == -1)
+
+    # gaps are between the end of one run and the start of the next one on the same row
+    same_row = start_rows[1:] == end_rows[:-1]
+    gap_rows = start_rows[1:][same_row]
+    gap_starts = end_cols[:-1][same_row]
+    gap_ends = start_cols[1:][same_row]
+
+    first_col, first_row = _cell_pos(pos, cell_mode)
+    digits = _numbers(int(max(rows + first_row, cols + first_col)) + 1)[1]
+    move_costs = 4 + digits[gap_rows + first_row + 1] + digits[gap_ends + first_col + 1]
+    repaint_costs = cumulative[gap_rows, gap_ends] - cumulative[gap_rows, gap_starts]
+    fill = repaint_costs <= move_costs
+
+    # mark the filled gaps with a difference array over the flattened mask, then integrate it
+    marks = np.zeros(rows * cols + 1, dtype=np.intp)
+    np.add.at(marks, gap_rows[fill] * cols + gap_starts[fill], 1)
+    np.add.at(marks, gap_rows[fill] * cols + gap_ends[fill], -1)
+    return dirty | (np.cumsum(marks[:-1]) > 0).reshape(rows, cols)
+
+def _previous_set(is_set: np.ndarray) -> np.ndarray:
+    """ For each entry, the index of the closest earlier entry where `is_set` is True, or -1 if there is none. """
+    indices = np.where(is_set, np.arange(is_set.size), -1)
+    previous = np.empty_like(indices)
+    previous[0] = -1
+    np.maximum.accumulate(indices[:-1], out=previous[1:])
+    return previous
+
+def _state_changes(is_set: np.ndarray, values: np.ndarray, color_mode: ColorMode) -> np.ndarray:
+    """ Which entries set a color (fg or bg) that the terminal doesn't already have from the last entry that set it. """
+    previous = _previous_set(is_set)
+    return is_set & ((previous < 0) | _differs(values, values[previous], color_mode))
+
+def _where(condition: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """ `np.where` for per-entry colors (rgb rows or palette indices). """
+    return np.where(condition[:, np.newaxis] if a.ndim == 2 else condition, a, b)
+
+def encode_cells(
+    colors: np.ndarray, 
+    painted: np.ndarray, 
+    pos: Tuple[int, int] = (0, 0), 
+    color_mode: ColorMode = "truecolor", 
+    masks: np.ndarray | None = None, 
+    cell_mode: CellMode = "half"
+    ) -> bytes:
+    """
+    Encodes only the character cells where the (rows, cols) mask `painted` is True.
+
+    Cells are emitted in reading order. Each horizontal run of painted cells starts with a cursor move,
+    and the foreground/background colors are tracked across the whole stream (across runs and rows too),
+    so a color code is only emitted when that color actually differs from the one the terminal already has set.
+    The very first colors are always set, since the terminal state before the frame is unknown.
+
+    Each cell also gets the glyph that should need the fewest color codes (estimated from the colors set
+    before it, all at once rather than cell by cell), all of which look the same:
+    - `▀` (fg = top, bg = bottom), or `▄` (fg = bottom, bg = top) when swapping the colors matches what's already set
+    - for cells where top and bottom are the same color: `█` if the fg already is that color,
+    otherwise a space (only needs the bg). Either way, the other color is left as it was for the next cells.
+
+    For the other cell modes, `colors` and `masks` come from `blocks.fit_cells`, and the cell's pattern and
+    the inverted pattern take the place of `▀` and `▄` (braille cells are never inverted or drawn as `█`).
+    """
+    cols = painted.shape[1]
+    cells = np.flatnonzero(painted)
+    count = cells.size
+    if count == 0:
+        return b""
+
+    rows_of, cols_of = np.divmod(cells, cols)
+    top, bottom = _split_cells(colors)
+    top, bottom = top[cells], bottom[cells]
+    patterns = np.ones(count, dtype=np.intp) if masks is None else masks.reshape(-1)[cells].astype(np.intp)
+    full_pattern = len(CELL_GLYPHS[cell_mode]) - 1
+
+    # a run starts wherever the next painted cell isn't directly to the right of the previous one
+    run_starts = np.ones(count, dtype=bool)
+    run_starts[1:] = (cells[1:] != cells[:-1] + 1) | (cols_of[1:] == 0)
+
+    # first guess: the pattern for two-colored cells, a space for uniform ones
+    uniform = ~_differs(top, bottom, color_mode)
+    choices = np.where(uniform, SPACE, PATTERN)
+
+    if SWAPPABLE[cell_mode]:
+        # what the terminal's fg/bg are before each cell with that guess. Spaces don't touch the fg
+        fg_before = _previous_set(~uniform)
+        fg_known = fg_before >= 0
+        fg_before_color = top[fg_before]
+        bg_before_color = np.roll(_where(uniform, top, bottom), 1, axis=0) # every cell sets the bg
+        bg_known = np.arange(count) > 0
+
+        matches_fg = lambda color: fg_known & ~_differs(color, fg_before_color, color_mode)
+        matches_bg = lambda color: bg_known & ~_differs(color, bg_before_color, color_mode)
+
+        # two-colored cells: inverted if it needs fewer (or shorter) color codes
+        pattern_cost = np.where(matches_fg(top), 0, _code_lengths(top, True, color_mode)) + np.where(matches_bg(bottom), 0, _code_lengths(bottom, False, color_mode))
+        inverted_cost = np.where(matches_fg(bottom), 0, _code_lengths(bottom, True, color_mode)) + np.where(matches_bg(top), 0, _code_lengths(top, False, color_mode))
+        choices[~uniform & (inverted_cost < pattern_cost)] = INVERTED
+
+        # uniform cells in the fg color left by the cells before them need no codes at all as █
+        fg_before_color = _where(choices == INVERTED, bottom, top)[fg_before]
+        bg_before_color = np.roll(_where(choices == PATTERN, bottom, top), 1, axis=0)
+        choices[uniform & matches_fg(top) & ~matches_bg(top)] = FULL
+
+    # exact SGR state machine for the chosen glyphs: emit a color only if it differs from the last one set
+    fg_colors = _where(choices == INVERTED, bottom, top)
+    bg_colors = _where(choices == PATTERN, bottom, top)
+    fg_changes = _state_changes(choices != SPACE, fg_colors, color_mode)
+    bg_changes = _state_changes(choices != FULL, bg_colors, color_mode)
+
+    glyphs = np.choose(choices, [patterns, full_pattern ^ patterns, 0, full_pattern])
+    glyph_table, glyph_lengths = _glyphs(cell_mode)
+    first_col, first_row = _cell_pos(pos, cell_mode)
+    segments = [
+        *_move_segments(rows_of + first_row, cols_of + first_col, run_starts),
+        *_color_segments(fg_colors, True, color_mode, fg_changes),
+        *_color_segments(bg_colors, False, color_mode, bg_changes),
+        (glyph_table, glyph_lengths, glyphs, None),
+    ]
+    return _assemble(count, segments)
+
+def encode_within_budget(
+    colors: np.ndarray, 
+    dirty: np.ndarray, 
+    errors: np.ndarray, 
+    max_bytes: int, 
+    pos: Tuple[int, int] = (0, 0), 
+    color_mode: ColorMode = "truecolor",
+    masks: np.ndarray | None = None, 
+    cell_mode: CellMode = "half"
+    ) -> Tuple[bytes, np.ndarray]:
+    """
+    Like `fill_cheap_gaps` + `encode_cells`, but the output is capped at `max_bytes`.
+
+    If repainting every dirty cell would take more than that, only the most visibly wrong cells are painted:
+    dirty cells are ranked by `errors` (rows, cols) and taken in that order until their estimated cost
+    (cursor move + both color codes + glyph, as if each cell was painted on its own) fills the budget.
+    The cells left out are still wrong on screen, and get picked up by the next diffs. The top-ranked cell is always
+    painted, even if it alone goes over `max_bytes`, so a budget smaller than a single cell still converges.
+
+    Returns the encoded bytes and the (rows, cols) mask of cells they paint.
+    """
+    painted = fill_cheap_gaps(colors, dirty, pos, color_mode, cell_mode)
+    encoded = encode_cells(colors, painted, pos, color_mode, masks, cell_mode)
+    if len(encoded) <= max_bytes:
+        return encoded, painted
+
+    rows, cols = dirty.shape
+    candidates = np.flatnonzero(dirty)
+    candidates = candidates[np.argsort(-errors.reshape(-1)[candidates], kind="stable")]
+
+    # upper bound of what each cell costs on its own
+    top, bottom = _split_cells(colors)
+    cell_rows, cell_cols = np.divmod(candidates, cols)
+    first_col, first_row = _cell_pos(pos, cell_mode)
+    digits = _numbers(int(max(rows + first_row, cols + first_col)) + 1)[1]
+    costs = (
+        4 + digits[cell_rows + first_row + 1] + digits[cell_cols + first_col + 1]
+        + _code_lengths(top[candidates], True, color_mode) + _code_lengths(bottom[candidates], False, color_mode)
+        + _glyphs(cell_mode)[1].max()
+    )
+    count = max(int(np.searchsorted(np.cumsum(costs), max_bytes, side="right")), 1)
+
+    # filling gaps between the chosen cells can (rarely) go over the estimate, so back off until it fits
+    while True:
+        selected = np.zeros(rows * cols, dtype=bool)
+        selected[candidates[:count]] = True
+        painted = fill_cheap_gaps(colors, selected.reshape(rows, cols), pos, color_mode, cell_mode)
+        encoded = encode_cells(colors, painted, pos, color_mode, masks, cell_mode)
+        if len(encoded) <= max_bytes or count == 1:
+            return encoded, painted
+        count //= 2
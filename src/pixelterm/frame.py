@@ -1,13 +1,22 @@
-from typing import Literal, Tuple
+import weakref
+from typing import Callable, List, Literal, Sequence, Tuple
 from .render_utils import (
-    fcode, blend_rgba_img_onto_rgb_img_inplace, adjust_for_anchor,
-    first_diff_color, last_diff_color, lesser, greater, draw_line,
-    betterprint, move_xy, term_height, term_width
+    blend_rgba_img_onto_rgb_img_inplace, blend_rgba_color_onto_rgb_img_inplace, adjust_for_anchor, draw_line, draw_lines,
+    term_height, term_width
 )
 import numpy as np
 from PIL import Image
 from .font import Font
-from .pixelterm_types import RGBTuple, RGBATuple, Anchor
+from .encoder import (
+    encode_raw, encode_cells, fill_cheap_gaps, dirty_cells, changed_rows, frame_colors, color_distance, encode_within_budget
+)
+from .blocks import CELL_SHAPES, fit_cells
+from .damage import Rect, add_damage, cell_rects, clip_rect, row_bands
+from .output import OutputSink, default_sink
+from .stats import RenderStats, RenderTimer
+from .gradient import gradient_image
+from .scroll import detect_scroll, exposed_rows, row_hashes, scroll_codes, shift_rows
+from .pixelterm_types import RGBTuple, RGBATuple, Anchor, ColorMode, CellMode, GradientDirection
 
 class PixeltermFrame:
     """
@@ -18,132 +27,341 @@ class PixeltermFrame:
     """
 
     width: int
-    """ Width in pixels (1px = width of 1 monospaced character) """
+    """ Width in pixels (1px = width of 1 monospaced character, or half of it in the other cell modes) """
     height: int
-    """ Height in pixels (2px = height of 1 monospaced character). Should always be even. """
+    """ Height in pixels (2px = height of 1 monospaced character, 3 in sextant and 4 in braille mode). Should always be a multiple of that. """
     pos: Tuple[int, int]
-    """ (x, y) of the top left pixel of the frame. y should always be even. """
+    """ (x, y) of the top left pixel of the frame. y should always be even (a multiple of the cell height). """
     pixels: np.ndarray
     """ 2d array of pixels. Each pixel is an rgb tuple. (0, 0) is the top left of the frame, not the top left of the screen. """
+    color_mode: ColorMode
+    """ How colors are sent to the terminal. "truecolor" (24-bit, default), or the "256"/"16" color palettes. """
+    cell_mode: CellMode
+    """ How pixels map to character cells. "half" (1x2 pixels per cell, default), "quadrant" (2x2), "sextant" (2x3) or "braille" (2x4). """
+    damage: List[Rect] | None
+    """
+    The (left, top, right, bottom) pixel rects drawn on since the frame was last identical to another one (see `reset_damage`),
+    merged so they never overlap. `render()` against that frame then only diffs these regions. None if not tracked (the default).
+    
+    Every drawing method records what it touches. Writing to `pixels` directly doesn't, so call `mark_dirty` after doing that.
+    """
 
-    def __init__(self, size: Tuple[int | None, int | None] = (None, None), pos: Tuple[int | None, int | None] = (0, 0)) -> None:
+    def __init__(
+        self, 
+        size: Tuple[int | None, int | None] = (None, None), 
+        pos: Tuple[int | None, int | None] = (0, 0),
+        color_mode: ColorMode = "truecolor",
+        cell_mode: CellMode = "half",
+        ) -> None:
         """ Optional params:
         - `size`: tuple (width, height) in pixels. None values will default to the terminal's width/height.
         - `pos`: tuple (x, y) in pixels, where the top left corner of the frame will be placed. Defaults to (0, 0) (top left of screen)
+        - `color_mode`: "truecolor" (default) sends exact 24-bit colors. "256" and "16" quantize the frame to the xterm 256-color
+        or the 16 ANSI color palette when rendering, for terminals without truecolor support, or to send ~2-3x fewer bytes.
+        - `cell_mode`: "half" (default) draws 1x2 pixels per character with `▀`. "quadrant" (2x2), "sextant" (2x3) and "braille" (2x4)
+        pack more pixels into every character, for 2-4x the resolution at about the same number of bytes. Each character can still only
+        show two colors, so every cell is fitted to its best two (see `blocks.fit_cells`). Sextants need a font with Unicode 13's
+        "Symbols for Legacy Computing", and braille dots leave gaps, so it works best for line art and plots.
         
         NOTE: Height and y-position MUST both be even. Each character is 2 pixels tall, and we cant render half-characters.
+        In the other cell modes, they have to be multiples of the cell height, and width and x-position multiples of the cell width.
         """
         
-        assert size[1] is None or size[1] % 2 == 0, f"[PixeltermFrame/__init__]: height must be even, instead got {size[1]}"
-        assert pos[1] is None or pos[1] % 2 == 0, f"[PixeltermFrame/__init__]: y position must be even, instead got {pos[1]}"
+        cell_height, cell_width = CELL_SHAPES[cell_mode]
+        if cell_mode == "half":
+            assert size[1] is None or size[1] % 2 == 0, f"[PixeltermFrame/__init__]: height must be even, instead got {size[1]}"
+            assert pos[1] is None or pos[1] % 2 == 0, f"[PixeltermFrame/__init__]: y position must be even, instead got {pos[1]}"
+        else:
+            assert (size[0] or 0) % cell_width == 0 and (size[1] or 0) % cell_height == 0, \
+                f"[PixeltermFrame/__init__]: size must be a multiple of {cell_width}x{cell_height} in {cell_mode} mode, instead got {size}"
+            assert (pos[0] or 0) % cell_width == 0 and (pos[1] or 0) % cell_height == 0, \
+                f"[PixeltermFrame/__init__]: pos must be a multiple of {cell_width}x{cell_height} in {cell_mode} mode, instead got {pos}"
         
-        self.width = size[0] if size[0] is not None else term_width()
-        self.height = size[1] if size[1] is not None else term_height()
+        self.width = size[0] if size[0] is not None else term_width() * cell_width
+        self.height = size[1] if size[1] is not None else term_height() // 2 * cell_height
         self.pos = pos
+        self.color_mode = color_mode
+        self.cell_mode = cell_mode
         self.pixels: np.ndarray = np.zeros((self.height, self.width, 3), dtype=np.uint8)
 
+        self.damage = None
+        self._damage_base: weakref.ref | None = None
+        self._base_generation = 0
+        self._generation = 0 # bumped on every draw, so the frame a damage list is relative to can tell if it was drawn on since
+
     def __eq__(self, other: "PixeltermFrame") -> bool:
         return np.array_equal(self.pixels, other.pixels)
     
     def __ne__(self, other: "PixeltermFrame") -> bool:
         return not self.__eq__(other)
 
-    def render_raw(self) -> None:
+    def render_raw(self, sink: OutputSink | None = None, synchronized: bool = False) -> None:
         """ Rerenders the FULL frame to the screen, without the need for a previous frame. 
-        Keep in mind, this is quite slow and should only be used for rendering things like first frames where there is no previous frame to diff from. """
-            
-        for i in range(0, self.height, 2):
-            string = ""
-            for j in range(self.width):
-                string += fcode(self.pixels[i,j], self.pixels[i+1,j]) + '▀' # for quick copy: ▀
-            
-            #compiled_str += string + "\n"
-            #betterprint(move_xy(self.pos[0], (i+self.pos[1])//2) + f"\x1b[0m{(i+self.pos[1])//2}{string[1:]}")
-            betterprint(move_xy(self.pos[0], (i+self.pos[1])//2) + string)
+        Keep in mind, this is quite slow and should only be used for rendering things like first frames where there is no previous frame to diff from.
+        
+        The encoded bytes are written to `sink` (see `OutputSink`), which defaults to stdout.
+        If `synchronized` is True, the frame is wrapped in a DEC synchronized update so it never shows half-drawn. """
+        
+        sink = sink or default_sink
+        sink.resync_needed = False # the full frame is drawn, so the screen is back in sync
+        sink.send(self.encode_raw(), synchronized)
 
-    def render(self, prev_frame: "PixeltermFrame | None" = None) -> None:
+    def encode_raw(self) -> bytes:
+        """ The bytes `render_raw()` writes, without writing them anywhere. """
+        # the whole frame is encoded in one go (see encoder.encode_raw), so it can be written with a single call
+        colors, masks = self._cell_colors(self.pixels)
+        return encode_raw(colors, self.pos, self.color_mode, masks, self.cell_mode)
+
+    def _cell_colors(self, pixels: np.ndarray) -> Tuple[np.ndarray, np.ndarray | None]:
+        """ The colors to encode for (a cell-aligned part of) the frame's `pixels` (see `encoder.frame_colors`),
+        and in the other cell modes the pattern masks of every cell (see `blocks.fit_cells`). """
+        if self.cell_mode == "half":
+            return frame_colors(pixels, self.color_mode), None
+        # cells are fitted in rgb, only the two colors that come out of that get quantized
+        fitted, masks = fit_cells(pixels, self.cell_mode)
+        return frame_colors(fitted, self.color_mode), masks
+
+    def _diff(
+        self, 
+        pixels: np.ndarray, 
+        prev_pixels: np.ndarray, 
+        pos: Tuple[int, int], 
+        tolerance: float, 
+        tolerance_metric: Literal["channel", "perceptual"],
+        timer: RenderTimer,
+        ) -> Tuple[np.ndarray, bytes]:
+        """ Diffs and encodes a cell-aligned region of the frame placed at `pos`. Returns the mask of the cells painted, and the bytes. """
+        
+        # in palette modes, everything below works on palette indices, so pixels that
+        # quantize to the same color as before don't count as changed
+        colors, masks = self._cell_colors(pixels)
+        prev_colors, prev_masks = self._cell_colors(prev_pixels)
+
+        # one vectorized pass over the whole region marks which character cells changed
+        dirty = dirty_cells(colors, prev_colors, tolerance, tolerance_metric)
+        if masks is not None:
+            dirty |= masks != prev_masks
+        timer.lap("diff")
+        if not dirty.any():
+            return dirty, b""
+
+        # split each row into runs of changed cells. Gaps between runs are jumped over with a
+        # cursor move, unless repainting the unchanged cells in between is cheaper.
+        painted = fill_cheap_gaps(colors, dirty, pos, self.color_mode, self.cell_mode)
+
+        # encode every run in one go; color codes are only emitted when the fg or bg actually changes
+        encoded = encode_cells(colors, painted, pos, self.color_mode, masks, self.cell_mode)
+        timer.lap("encode")
+        return painted, encoded
+
+    def render(
+        self, 
+        prev_frame: "PixeltermFrame | None" = None, 
+        sink: OutputSink | None = None, 
+        synchronized: bool = False,
+        tolerance: float = 0,
+        tolerance_metric: Literal["channel", "perceptual"] = "channel",
+        max_bytes: int | None = None,
+        scroll: bool = False,
+        on_stats: Callable[[RenderStats], None] | None = None,
+        ) -> np.ndarray | None:
         """ Prints the frame to the screen.
         Optimized by only drawing the changes from the previous frame. 
         
         If no previous frame is provided or is None, draws the entire frame from scratch
         using `PixeltermFrame.render_raw()`.
-        """
         
-        if prev_frame is None: 
-            return self.render_raw()
+        The encoded bytes are written to `sink` (see `OutputSink`), which defaults to stdout.
+        If `synchronized` is True, the frame is wrapped in a DEC synchronized update so it never shows half-drawn.
         
-        if self.pixels.shape != prev_frame.pixels.shape:
-            # screen probably resized. This prevents errors.
-            return self.render_raw()
+        `tolerance` (truecolor only) makes the diff lossy: cells whose pixels are within `tolerance` of `prev_frame`
+        (see `encoder.color_distance` for the metrics) are left alone. For that to not drift further and further away,
+        `prev_frame` has to be what is actually on screen, not the last frame that was drawn - `Renderer` takes care of that.
+        
+        `max_bytes` caps how much a diff can write. When more changed than fits, the cells with the largest color error
+        (measured with `tolerance_metric`) are drawn first, and the rest is left for later frames to catch up on. Same as with
+        `tolerance`, `prev_frame` has to be what's actually on screen. Full redraws (no `prev_frame`) are never capped, and a diff
+        always draws at least one cell, even if that goes over a tiny `max_bytes`.
+        
+        If this frame's `damage` is relative to `prev_frame` (see `reset_damage`), only the damaged regions are diffed and
+        encoded, so the cost scales with how much was drawn instead of the frame size. Not combined with `max_bytes` or `scroll`
+        (with those, the whole frame is diffed).
+        
+        `scroll` (opt-in) looks for content that moved up or down between the frames, moves it with the terminal's own scrolling
+        (see `scroll.detect_scroll`), then only draws the rows scrolled in and whatever else changed. Terminals can only scroll
+        whole lines, so only use this if the frame spans the full width of the terminal. Not combined with `tolerance` or `max_bytes`.
+        
+        `on_stats`, if given, is called with the `RenderStats` of this render (timings of every stage, bytes, cells and codes sent).
+        
+        Returns the (rows, cols) mask of the character cells that were drawn, or None if the whole frame was redrawn.
+        """
+        
+        sink = sink or default_sink
+        if sink.resync_needed:
+            prev_frame = None # what's on screen isn't known anymore, so there's nothing to diff against
 
-        final_string = ""
+        timer = RenderTimer()
+        encoded, painted = self._encode(prev_frame, tolerance, tolerance_metric, max_bytes, scroll, timer)
+        if painted is None:
+            sink.resync_needed = False # the full frame is drawn, so the screen is back in sync
+        sink.send(encoded, synchronized)
 
-        i = 0
-        for top_row_index in range(0, self.height, 2):       
-            first_diff_row1 = first_diff_color(self.pixels[top_row_index], prev_frame.pixels[top_row_index])
-            first_diff_row2 = first_diff_color(self.pixels[top_row_index+1], prev_frame.pixels[top_row_index+1])
-            
-            last_diff_row1 = last_diff_color(self.pixels[top_row_index], prev_frame.pixels[top_row_index])
-            last_diff_row2 = last_diff_color(self.pixels[top_row_index+1], prev_frame.pixels[top_row_index+1])
-            
-            print_start = lesser(first_diff_row1, first_diff_row2)
-            print_end = greater(last_diff_row1, last_diff_row2)
-            
-            start, end = print_start, print_end
-            
-            # if both are None, that means the rows were the exact same, so we don't need to print anything
-            if start is None and end is None:
-                
-                i += 1
-                continue
-
-            final_string += move_xy(int(start)+self.pos[0], i+self.pos[1]//2)
-            string = ""
-            # get a numpy array of which indices are repeat colors (so we can skip fcode)
-            color_strip = self.pixels[i*2:i*2+2, start:end+1]
-            colors_diffs = np.any(color_strip[:, 1:] != color_strip[:, :-1], axis=(0, 2))
-            """ [diff(1, 0), diff(2, 1), ...]. True if different, False if same. """
-            
-            
-            #
-            
-            
-            # add the first pixel
-            string += fcode(self.pixels[i*2,start], self.pixels[i*2+1,start]) + '▀'
-
-            for j in range(start+1, end+1):
-                # if colors_diffs is True for the current pixel, that means the colors are different from the previous pixel
-                # in that case we have to re-fcode
-                if colors_diffs[j-start-1]:
-                    string += fcode(self.pixels[i*2,j], self.pixels[i*2+1,j]) + '▀'
-                else:
-                    string += '▀'
-            # while loop ize ^^^
+        if on_stats is not None:
+            timer.lap("write")
+            cell_height, cell_width = CELL_SHAPES[self.cell_mode]
+            on_stats(RenderStats.measure(encoded, painted, (self.height // cell_height) * (self.width // cell_width), timer))
+        return painted
 
-            
-            # go to coordinates in terminal, and print the string
-            # terminal coordinates: start, i
-            
-            
-            
-            #start_time_2 = perf_counter()
-           # betterprint(move_xy(int(start)+self.pos[0], i+self.pos[1]//2) + string)
-            #print_buffer.append(((int(start)+self.pos[0], i+self.pos[1]//2), string))
-            final_string += string
-            i += 1
-            
+    def encode(
+        self, 
+        prev_frame: "PixeltermFrame | None" = None, 
+        tolerance: float = 0,
+        tolerance_metric: Literal["channel", "perceptual"] = "channel",
+        max_bytes: int | None = None,
+        scroll: bool = False,
+        ) -> bytes:
+        """ The bytes `render()` writes, without writing them anywhere (see `render()` for the arguments).
+        Nothing here touches the terminal, so frames can be encoded on worker threads or processes and written out later.
         
-        # combine all the print calls into a single call
-        #for coords, string in print_buffer:
-        #    final_string += move_xy(*coords) + string
-            
-        betterprint(final_string)
+        Keep in mind that `render()` also falls back to a full redraw when the sink needs a resync, `encode()` can't know about that. """
+        return self._encode(prev_frame, tolerance, tolerance_metric, max_bytes, scroll, RenderTimer())[0]
+
+    def _encode(
+        self, 
+        prev_frame: "PixeltermFrame | None", 
+        tolerance: float,
+        tolerance_metric: Literal["channel", "perceptual"],
+        max_bytes: int | None,
+        scroll: bool,
+        timer: RenderTimer,
+        ) -> Tuple[bytes, np.ndarray | None]:
+        """ Encodes the frame, see `render()`. Returns the bytes, and the mask of the cells painted (None if the whole frame was).
+        The time spent is split between the diff and encode stages of `timer`. """
+        
+        if prev_frame is None or self.pixels.shape != prev_frame.pixels.shape or (self.color_mode, self.cell_mode) != (prev_frame.color_mode, prev_frame.cell_mode):
+            # nothing to diff against, or the screen probably resized (diffing would error)
+            encoded = self.encode_raw()
+            timer.lap("encode")
+            return encoded, None
+
+        cell_height, cell_width = CELL_SHAPES[self.cell_mode]
+        rows, cols = self.height // cell_height, self.width // cell_width
+        painted = np.zeros((rows, cols), dtype=bool)
+
+        if max_bytes is None:
+            prev_pixels = prev_frame.pixels
+            encoded = []
+            # scroll detection needs every row of the frame anyway, so when it's on the damage list isn't used
+            find_scroll = scroll and tolerance == 0
+            damage = None if find_scroll else self._damage_since(prev_frame)
+            if damage is not None:
+                # only what was drawn since the frames were identical can differ, so only look at that
+                regions = cell_rects(damage, cell_height, cell_width)
+            else:
+                # rows that are exactly the same as before get rejected in one pass over the frame,
+                # only the bands of rows that changed are diffed cell by cell (nothing at all if no row changed)
+                changed = changed_rows(self.pixels, prev_pixels, cell_height)
+                timer.lap("diff")
+                if not changed.any():
+                    return b"", painted
+
+                found = detect_scroll(row_hashes(self.pixels, cell_height), row_hashes(prev_pixels, cell_height)) if find_scroll else None
+                timer.lap("diff")
+                if found is not None:
+                    # scroll what's on screen, then diff against that instead. The rows scrolled in are blank, so they're painted in full
+                    top, bottom, shift = found
+                    first_row = self.pos[1] // cell_height
+                    encoded.append(scroll_codes(first_row + top, first_row + bottom, shift))
+                    prev_pixels = shift_rows(prev_pixels, top, bottom, shift, cell_height)
+
+                    start, end = exposed_rows(top, bottom, shift)
+                    colors, masks = self._cell_colors(self.pixels[start * cell_height:end * cell_height])
+                    encoded.append(encode_raw(colors, (self.pos[0], self.pos[1] + start * cell_height), self.color_mode, masks, self.cell_mode))
+                    painted[start:end] = True
+                    timer.lap("encode")
+
+                    changed = changed_rows(self.pixels, prev_pixels, cell_height)
+                    changed[start:end] = False
+                    timer.lap("diff")
+
+                regions = row_bands(changed, cols)
+
+            for left, top, right, bottom in regions:
+                region = (slice(top * cell_height, bottom * cell_height), slice(left * cell_width, right * cell_width))
+                region_pos = (self.pos[0] + left * cell_width, self.pos[1] + top * cell_height)
+                painted[top:bottom, left:right], region_encoded = self._diff(
+                    self.pixels[region], prev_pixels[region], region_pos, tolerance, tolerance_metric, timer
+                )
+                encoded.append(region_encoded)
+            return b"".join(encoded), painted
+
+        # nothing changed: a single memcmp-like check, no mask or encoding needed
+        if np.array_equal(self.pixels, prev_frame.pixels):
+            timer.lap("diff")
+            return b"", painted
+
+        colors, masks = self._cell_colors(self.pixels)
+        prev_colors, prev_masks = self._cell_colors(prev_frame.pixels)
+        dirty = dirty_cells(colors, prev_colors, tolerance, tolerance_metric)
+        if masks is not None:
+            dirty |= masks != prev_masks
+
+        # most visibly wrong cells first, see encoder.encode_within_budget
+        errors = color_distance(self.pixels, prev_frame.pixels, tolerance_metric).reshape(rows, cell_height, cols, cell_width).max(axis=(1, 3))
+        timer.lap("diff")
+        encoded, painted = encode_within_budget(colors, dirty, errors, max_bytes, self.pos, self.color_mode, masks, self.cell_mode)
+        timer.lap("encode")
+        return encoded, painted
+
+    def _damage_since(self, prev_frame: "PixeltermFrame") -> List[Rect] | None:
+        """ `damage`, if it's relative to `prev_frame` and `prev_frame` wasn't drawn on since. Otherwise None. """
+        if self.damage is None or self._damage_base is None or self._damage_base() is not prev_frame:
+            return None
+        return self.damage if prev_frame._generation == self._base_generation else None
+
+    def reset_damage(self, base: "PixeltermFrame") -> None:
+        """
+        Declares that this frame's pixels are identical to `base`'s right now, and starts tracking `damage` from here.
+        As long as `base` isn't drawn on, `render(base)` then only diffs what was drawn on this frame since.
+        Opt-in, since direct writes to `pixels` then have to be marked with `mark_dirty`. `Renderer` (with `preserve`) does this already.
+        """
+        self.damage = []
+        self._damage_base = weakref.ref(base)
+        self._base_generation = base._generation
+
+    def mark_dirty(self, rect: Tuple[int, int, int, int] | None = None) -> None:
+        """ Records that the (x, y, width, height) region was changed by writing to `pixels` directly (see `damage`). None = the whole frame. """
+        if rect is None:
+            self._touch(0, 0, self.width, self.height)
+        else:
+            x, y, width, height = rect
+            self._touch(x, y, x + width, y + height)
+
+    def _touch(self, left: int, top: int, right: int, bottom: int) -> None:
+        """ Called by everything that draws, with the (clipped or not) bounds of what it drew. """
+        self._generation += 1
+        if self.damage is not None:
+            rect = clip_rect((int(left), int(top), int(right), int(bottom)), self.width, self.height)
+            if rect is not None:
+                add_damage(self.damage, rect)
 
     def __getitem__(self, index: int | tuple) -> RGBTuple:
         return self.pixels[index]
     
     def __setitem__(self, index: int | tuple, value: RGBTuple) -> None:
         self.pixels[index] = value
+
+        # bounds of whatever was indexed (ints, slices, index arrays...) along y and x
+        index = index if isinstance(index, tuple) else (index,)
+        if any(i is Ellipsis or i is None for i in index): # the first two aren't y and x then
+            return self.mark_dirty()
+        try:
+            ys = np.arange(self.height)[index[0]]
+            xs = np.arange(self.width)[index[1]] if len(index) > 1 else np.arange(self.width)
+        except (IndexError, TypeError): # e.g. a 2d boolean mask
+            return self.mark_dirty()
+        if np.size(ys) and np.size(xs):
+            self._touch(np.min(xs), np.min(ys), np.max(xs) + 1, np.max(ys) + 1)
         
     def get_pixel(self, x: int, y: int) -> RGBTuple:
         """ Returns the pixel at the given x, y coordinates as an RGB tuple. """
@@ -152,36 +370,61 @@ class PixeltermFrame:
     def set_pixel(self, x: int, y: int, color: RGBTuple) -> None:
         """ Set the exact color of a pixel at the given x, y coordinates. """
         self.pixels[y, x] = color
+        x, y = x % self.width, y % self.height # negative coordinates count from the end, like numpy
+        self._touch(x, y, x + 1, y + 1)
 
     def fill(self, color: RGBTuple) -> None:
         """ Fills the entire canvas with the given color. RGB (3-tuple) required. Should be pretty efficient because of numpy. """
         assert len(color) == 3, f"[FrameLayer/fill]: color must be an rgb (3 ints) tuple, instead got {color}"
         self.pixels[:,:] = color
+        self.mark_dirty()
         
     def fill_with_gradient(
         self, 
         color1: RGBTuple, 
         color2: RGBTuple, 
-        direction: Literal["horizontal", "vertical"] = "horizontal"
+        direction: GradientDirection = "horizontal"
         ) -> None:
         """ Fills the entire canvas with a gradient from color1 to color2.
         
         horizontal=color changes from left to right, vertical=color changes from top to bottom.
+        Also takes "diagonal" and "radial", see `add_gradient` for those and for more than 2 colors.
         """
+        self.add_gradient((color1, color2), 0, 0, self.width, self.height, direction)
+
+    def add_gradient(
+        self,
+        colors: Sequence[RGBTuple],
+        x: int = 0, y: int = 0,
+        width: int | None = None, height: int | None = None,
+        direction: GradientDirection = "horizontal",
+        positions: Sequence[float] | None = None,
+        anchor: Anchor = "top-left",
+        ) -> None:
+        """ Draws a rectangle filled with a gradient through `colors` (2 or more), anchored at (x, y) like `add_rect`.
+        Width and height default to the frame's.
         
-        # create a gradient
-        if direction == "horizontal":
-            gradient = np.linspace(color1, color2, self.width)
-            
-            # fill each row with the gradient
-            for i in range(self.height):
-                self.pixels[i] = gradient
-            
-        elif direction == "vertical":
-            gradient = np.linspace(color1, color2, self.height)
-            
-            for i in range(self.width):
-                self.pixels[:,i] = gradient
+        `direction`: "horizontal", "vertical", "diagonal" (top left to bottom right corner) or "radial" (from the center out).
+        `positions`: where each color sits along the gradient, from 0 to 1. Defaults to evenly spaced.
+        
+        The gradient is computed once and cached (see `gradient.gradient_image`), so redrawing the same one every frame is just a copy.
+        """
+        width = self.width if width is None else width
+        height = self.height if height is None else height
+        assert width > 0 and height > 0, f"[PixeltermFrame/add_gradient]: width and height must be greater than 0, instead got {width}, {height}"
+        
+        left, top = adjust_for_anchor(x, y, width, height, anchor)
+        clipped_left, clipped_top = max(left, 0), max(top, 0)
+        clipped_right, clipped_bottom = min(left + width, self.width), min(top + height, self.height)
+        if clipped_left >= clipped_right or clipped_top >= clipped_bottom:
+            return
+        
+        # the whole gradient is computed (and cached) at its full size, so clipping doesn't squash it
+        image = gradient_image(width, height, colors, direction, positions)
+        self.pixels[clipped_top:clipped_bottom, clipped_left:clipped_right] = image[
+            clipped_top - top:clipped_bottom - top, clipped_left - left:clipped_right - left
+        ]
+        self._touch(clipped_left, clipped_top, clipped_right, clipped_bottom)
 
     def add_rect(
         self, 
@@ -200,29 +443,26 @@ class PixeltermFrame:
 
         assert width > 0 and height > 0, f"[PixeltermFrame/add_rect]: width and height must be greater than 0, instead got {width}, {height}"
 
-        # add alpha to color/outline if it's an rgb tuple
-        if len(color) == 3:
-            color = (*color, 255)
-        if len(outline_color) == 3:
-            outline_color = (*outline_color, 255)
-
-        padded_width = width + outline_width*2
-        padded_height = height + outline_width*2
-        padded_x = x - outline_width
-        padded_y = y - outline_width
-
-        padded_x = round(padded_x)
-        padded_y = round(padded_y)
-        padded_width = round(padded_width)
-        padded_height = round(padded_height)
-            
-        rect_as_pixels = np.full((padded_height, padded_width, 4), outline_color, dtype=np.uint8)
-        
-        # set the middle of rect_as_pixels to the color
-        rect_as_pixels[outline_width:outline_width+height, outline_width:outline_width+width] = color
-        
-        # lol the rectangle is just an "image", reuse code
-        self.add_image_from_pixels(rect_as_pixels, padded_x, padded_y, anchor)
+        # everything is drawn straight into the frame, in slices: the inside, then the outline as 4 edges around it
+        padded_width = round(width + outline_width*2)
+        padded_height = round(height + outline_width*2)
+        left, top = adjust_for_anchor(round(x - outline_width), round(y - outline_width), padded_width, padded_height, anchor)
+        right, bottom = left + padded_width, top + padded_height
+
+        self._fill_rect(left + outline_width, top + outline_width, right - outline_width, bottom - outline_width, color)
+        if outline_width > 0:
+            self._fill_rect(left, top, right, top + outline_width, outline_color)
+            self._fill_rect(left, bottom - outline_width, right, bottom, outline_color)
+            self._fill_rect(left, top + outline_width, left + outline_width, bottom - outline_width, outline_color)
+            self._fill_rect(right - outline_width, top + outline_width, right, bottom - outline_width, outline_color)
+        self._touch(left, top, right, bottom)
+
+    def _fill_rect(self, left: int, top: int, right: int, bottom: int, color: RGBTuple | RGBATuple) -> None:
+        """ Fills the pixels in [left, right) x [top, bottom), clipped to the frame, with an rgb or rgba color. Doesn't record damage. """
+        left, top = max(left, 0), max(top, 0)
+        right, bottom = min(right, self.width), min(bottom, self.height)
+        if left < right and top < bottom:
+            blend_rgba_color_onto_rgb_img_inplace(self.pixels[top:bottom, left:right], color)
         
     def add_large_text(
         self, 
@@ -260,6 +500,7 @@ class PixeltermFrame:
             self.pixels[clipped_top:clipped_top+pixels.shape[0]-offset_top, clipped_left:clipped_left+pixels.shape[1]-offset_left],
             pixels[offset_top:, offset_left:]
         )
+        self._touch(clipped_left, clipped_top, left + pixels.shape[1], top + pixels.shape[0])
 
     def add_image_from_filepath(self, filepath: str, x: int, y: int, anchor: Anchor = "top-left") -> None:
         """ Adds an image to the frame at the given position. """
@@ -288,15 +529,34 @@ class PixeltermFrame:
 
         blend_rgba_img_onto_rgb_img_inplace(
             self.pixels[int(clipped_y1):int(clipped_y1+pixels.shape[0]-offset_y1), int(clipped_x1):int(clipped_x1+pixels.shape[1]-offset_x1)],
-            pixels[int(offset_y1):self.height, int(offset_x1):self.width]
+            pixels[int(offset_y1):, int(offset_x1):] # clipped to the frame's right and bottom edges by the blend
         )
+        self._touch(clipped_x1, clipped_y1, x + pixels.shape[1], y + pixels.shape[0])
 
     def add_line(self, pos1: Tuple[int, int], pos2: Tuple[int, int], color: RGBTuple, width: int = 1) -> None:
         """ Draws a non-antialiased line between two points on the frame. Width defaults to 1."""
-        draw_line(self.pixels, pos1, pos2, color, width)
+        bounds = draw_line(self.pixels, pos1, pos2, color, width)
+        if bounds is not None:
+            self._touch(*bounds)
+
+    def add_lines(self, segments: Sequence[Tuple[Tuple[int, int], Tuple[int, int]]], color: RGBTuple, width: int = 1) -> None:
+        """ Draws many ((x1, y1), (x2, y2)) lines at once, same as calling `add_line` for each of them but a lot faster
+        (see `render_utils.draw_lines`). Good for wireframes and anything else made of lots of separate lines. """
+        bounds = draw_lines(self.pixels, segments, color, width)
+        if bounds is not None:
+            self._touch(*bounds)
+
+    def add_polyline(self, points: Sequence[Tuple[int, int]], color: RGBTuple, width: int = 1, closed: bool = False) -> None:
+        """ Draws lines through all (x, y) `points` in order, in one go (see `add_lines`). Good for charts.
+        If `closed`, the last point is connected back to the first one too. """
+        assert len(points) >= 2, f"[PixeltermFrame/add_polyline]: need at least 2 points, instead got {len(points)}"
+        points = np.asarray(points)
+        ends = np.roll(points, -1, axis=0) if closed else points[1:]
+        self.add_lines(np.stack((points[:len(ends)], ends), axis=1), color, width)
     
     def copy(self) -> "PixeltermFrame":
-        """ Returns a deep copy of this PixeltermFrame. (except for the terminal reference) """
-        new_frame = PixeltermFrame((self.width, self.height), self.pos)
+        """ Returns a deep copy of this PixeltermFrame. (except for the terminal reference)
+        Call `reset_damage(copy)` after, to only diff what gets drawn from then on when rendering against the copy. """
+        new_frame = PixeltermFrame((self.width, self.height), self.pos, self.color_mode, self.cell_mode)
         new_frame.pixels = np.copy(self.pixels)
         return new_frame
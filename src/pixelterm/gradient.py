@@ -0,0 +1,81 @@
+import numpy as np
+from functools import lru_cache
+from typing import Sequence, Tuple
+from .pixelterm_types import RGBTuple, GradientDirection
+
+def gradient_image(
+    width: int,
+    height: int,
+    colors: Sequence[RGBTuple],
+    direction: GradientDirection = "horizontal",
+    positions: Sequence[float] | None = None,
+    ) -> np.ndarray:
+    """
+    A (height, width, 3) uint8 image of a gradient through `colors`.
+
+    - `direction`: "horizontal" (left to right), "vertical" (top to bottom), "diagonal" (top left to bottom right corner),
+    or "radial" (from the center out to the corners).
+    - `positions`: where each color sits along the gradient, from 0 to 1 in increasing order. Defaults to evenly spaced.
+
+    Gradients are cached by their parameters (see `clear_gradient_cache`), so drawing the same one again is just a copy.
+    The returned array is the cached one, so it's read-only.
+    """
+    assert len(colors) >= 2, f"[gradient_image]: at least 2 colors are needed, instead got {len(colors)}"
+    assert positions is None or len(positions) == len(colors), f"[gradient_image]: need one position per color, instead got {len(positions)} for {len(colors)} colors"
+    return _cached_gradient(
+        width, height, tuple(tuple(int(channel) for channel in color[:3]) for color in colors),
+        direction, None if positions is None else tuple(float(position) for position in positions),
+    )
+
+def clear_gradient_cache() -> None:
+    """ Drops every cached gradient. """
+    _cached_gradient.cache_clear()
+
+@lru_cache(maxsize=16)
+def _cached_gradient(
+    width: int,
+    height: int,
+    colors: Tuple[RGBTuple, ...],
+    direction: GradientDirection,
+    positions: Tuple[float, ...] | None,
+    ) -> np.ndarray:
+    if direction in ("horizontal", "vertical"):
+        ramp = _ramp(colors, positions, width if direction == "horizontal" else height)
+        # stored in full: copying a whole image out of the cache is a lot faster than broadcasting a column of pixels
+        image = np.ascontiguousarray(np.broadcast_to(ramp[np.newaxis] if direction == "horizontal" else ramp[:, np.newaxis], (height, width, 3)))
+        image.setflags(write=False)
+        return image
+
+    # how far along the gradient every pixel is, from 0 to 1
+    x = np.linspace(0, 1, width) if width > 1 else np.zeros(1)
+    y = np.linspace(0, 1, height) if height > 1 else np.zeros(1)
+    if direction == "diagonal":
+        t = (x[np.newaxis] + y[:, np.newaxis]) / 2
+    elif direction == "radial":
+        # distances in pixels, so the gradient stays round on frames that aren't square
+        dx = (x - 0.5) * (width - 1)
+        dy = (y - 0.5) * (height - 1)
+        t = np.hypot(dx[np.newaxis], dy[:, np.newaxis])
+        t /= max(t.max(), 1e-9)
+    else:
+        raise ValueError(f"[gradient_image]: unknown direction {direction!r}")
+
+    image = _interpolate(colors, positions, t)
+    image.setflags(write=False)
+    return image
+
+def _ramp(colors: Tuple[RGBTuple, ...], positions: Tuple[float, ...] | None, length: int) -> np.ndarray:
+    """ The gradient along a single line of `length` pixels, as a (length, 3) uint8 array. """
+    if len(colors) == 2 and positions is None:
+        # exactly what `fill_with_gradient` always drew: channels truncated, not rounded
+        return np.linspace(colors[0], colors[1], length).astype(np.uint8)
+    return _interpolate(colors, positions, np.linspace(0, 1, length))
+
+def _interpolate(colors: Tuple[RGBTuple, ...], positions: Tuple[float, ...] | None, t: np.ndarray) -> np.ndarray:
+    """ The colors at gradient positions `t` (any shape, 0 to 1), as a (*t.shape, 3) uint8 array. """
+    stops = np.linspace(0, 1, len(colors)) if positions is None else np.array(positions)
+    channels = np.array(colors, dtype=np.float64).T
+    image = np.empty((*t.shape, 3), dtype=np.uint8)
+    for channel in range(3):
+        image[..., channel] = np.interp(t, stops, channels[channel])
+    return image
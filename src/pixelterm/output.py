@@ -0,0 +1,194 @@
+import os, sys
+from queue import Queue, Full, Empty
+from threading import RLock, Thread
+from typing import BinaryIO, Literal, TextIO
+
+SYNC_BEGIN = b"\033[?2026h"
+""" Begins a DEC synchronized update (mode 2026): the terminal holds off on showing anything until `SYNC_END`. """
+SYNC_END = b"\033[?2026l"
+""" Ends a DEC synchronized update, showing everything written since `SYNC_BEGIN` at once. """
+
+class OutputSink:
+    """
+    Byte-oriented destination for rendered frames.
+
+    Encoded output is staged in a preallocated, reusable `bytearray` with `write()`, and sent to the target
+    with `flush()`, which keeps writing until everything went through (so partial writes, like the ones
+    `os.write` does on pipes and ptys, are never lost).
+
+    The target can be:
+    - `None` (default): whatever `sys.stdout` is at the time of flushing. Uses its binary `.buffer`
+    when there is one, after flushing any text that was `print()`ed before.
+    - an `int`: a raw file descriptor, written with `os.write` (e.g. `sys.stdout.fileno()`, a pty or a socket's fd)
+    - a binary stream: anything with a `write(bytes)` method, e.g. `sys.stdout.buffer`, `open(path, "wb")` or `io.BytesIO()`
+    - a text stream: written through its `.buffer` if it has one, otherwise decoded to str (e.g. `io.StringIO()`)
+    """
+
+    def __init__(self, target: int | BinaryIO | TextIO | None = None, buffer_size: int = 1 << 16) -> None:
+        self.target = target
+        """ Where flushed bytes go. See the class docstring. """
+        self.resync_needed = False
+        """ Set when output was lost (see `ThreadedSink`), so what's on screen no longer matches the last rendered frame.
+        The next `PixeltermFrame.render()` to this sink redraws the full frame instead of a diff. """
+        self._buffer = bytearray(buffer_size)
+        self._length = 0
+        self._lock = RLock()
+
+    def write(self, data: bytes) -> None:
+        """ Stages `data` to be sent on the next `flush()`. The staging buffer grows if needed, and is reused afterwards. """
+        with self._lock:
+            end = self._length + len(data)
+            if end > len(self._buffer):
+                self._buffer.extend(bytes(max(end - len(self._buffer), len(self._buffer))))
+            self._buffer[self._length:end] = data
+            self._length = end
+
+    def flush(self) -> None:
+        """ Sends everything staged so far to the target. """
+        with self._lock:
+            if self._length == 0:
+                return
+            with memoryview(self._buffer) as view:
+                self._write_all(view[:self._length])
+            self._length = 0
+
+    def send(self, data: bytes, synchronized: bool = False) -> None:
+        """ Shorthand for `write(data)` followed by `flush()`, done atomically if the sink is shared between threads.
+        
+        If `synchronized` is True, `data` is wrapped in a DEC synchronized update so that terminals that support it
+        (mode 2026) show it all at once, never half-drawn. Terminals that don't support it ignore the codes. """
+        synchronized = synchronized and len(data) > 0 # nothing to hold back
+        with self._lock:
+            if synchronized:
+                self.write(SYNC_BEGIN)
+            self.write(data)
+            if synchronized:
+                self.write(SYNC_END)
+            self.flush()
+
+    def _write_all(self, data: memoryview) -> None:
+        """ Writes all of `data` to the target, looping on partial writes. """
+        target = self.target if self.target is not None else sys.stdout
+
+        if isinstance(target, int):
+            while data:
+                data = data[os.write(target, data):]
+            return
+
+        if hasattr(target, "encoding"): # text stream
+            target.flush() # anything print()ed before this frame has to come out first
+            if not hasattr(target, "buffer"):
+                target.write(data.tobytes().decode())
+                return
+            target = target.buffer
+
+        while data:
+            written = target.write(data)
+            # buffered streams write everything, raw/non-blocking ones can return a partial count (or None if nothing was written)
+            data = data[written if written is not None else 0:]
+        if hasattr(target, "flush"):
+            target.flush()
+
+class ThreadedSink(OutputSink):
+    """
+    `OutputSink` that does the actual (blocking) writing on a background thread.
+
+    `flush()` hands the staged frame to a writer thread through a bounded queue and returns right away,
+    so the next frame can be drawn and encoded while the terminal is still receiving the current one.
+
+    What happens when the terminal can't keep up and the queue is full depends on `policy`:
+    - `"block"`: wait for the writer to make room (back-pressure, like a normal sink).
+    - `"coalesce"`: merge all pending frames and the new one into a single write. Nothing is lost, the writer just catches up in one go.
+    - `"drop"`: throw the pending frames away. Since every diff was encoded against the frame before it, the new
+    frame is dropped too, and `resync_needed` is set so the next `render()` redraws the full frame.
+    The screen keeps showing the last frame that was written in the meantime.
+
+    Call `close()` (or use it as a context manager) to wait for everything to be written and stop the thread.
+    """
+
+    def __init__(
+        self,
+        target: int | BinaryIO | TextIO | None = None,
+        max_pending: int = 2,
+        policy: Literal["block", "coalesce", "drop"] = "block",
+        buffer_size: int = 1 << 16,
+        ) -> None:
+        assert policy in ("block", "coalesce", "drop"), f"[ThreadedSink/__init__]: policy must be one of block, coalesce, drop, instead got {policy}"
+        super().__init__(target, buffer_size)
+
+        self.policy = policy
+        self.frames_dropped = 0
+        """ Number of frames thrown away by the `"drop"` policy. """
+        self.frames_coalesced = 0
+        """ Number of frames merged into another one by the `"coalesce"` policy. """
+        self._queue: Queue = Queue(max_pending)
+        self._error: BaseException | None = None
+        self._thread = Thread(target=self._writer, daemon=True, name="pixelterm-writer")
+        self._thread.start()
+
+    def flush(self) -> None:
+        """ Queues everything staged so far to be written by the writer thread. """
+        with self._lock:
+            self._raise_writer_error()
+            if self._length == 0:
+                return
+            frame = bytes(self._buffer[:self._length])
+            self._length = 0
+
+            if self.policy == "block":
+                self._queue.put(frame)
+                return
+            try:
+                self._queue.put_nowait(frame)
+            except Full:
+                pending = self._take_pending()
+                if self.policy == "coalesce":
+                    self.frames_coalesced += len(pending)
+                    self._queue.put(b"".join(pending) + frame)
+                else:
+                    self.frames_dropped += len(pending) + 1
+                    self.resync_needed = True
+
+    def close(self) -> None:
+        """ Waits until every queued frame is written, then stops the writer thread. """
+        self.flush()
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._raise_writer_error()
+
+    def __enter__(self) -> "ThreadedSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _take_pending(self) -> list:
+        """ Removes and returns every frame the writer hasn't picked up yet, oldest first. """
+        pending = []
+        while True:
+            try:
+                frame = self._queue.get_nowait()
+            except Empty:
+                return pending
+            if frame is None: # closing, put the stop signal back
+                self._queue.put(None)
+                return pending
+            pending.append(frame)
+
+    def _writer(self) -> None:
+        while (frame := self._queue.get()) is not None:
+            if self._error is not None:
+                continue # already failed: keep draining so flush() never blocks forever, the error is raised there
+            try:
+                self._write_all(memoryview(frame))
+            except BaseException as e:
+                self._error = e
+
+    def _raise_writer_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+default_sink = OutputSink()
+""" The sink frames are rendered to when none is given, writes to `sys.stdout`. """
@@ -0,0 +1,68 @@
+import numpy as np
+from typing import Dict
+from .pixelterm_types import ColorMode
+
+PALETTE_16 = np.array([
+    (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0),
+    (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+    (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0),
+    (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+], dtype=np.uint8)
+""" The 16 ANSI colors, as xterm shows them by default (other terminals and themes will differ slightly). """
+
+def _xterm_256_palette() -> np.ndarray:
+    palette = np.zeros((256, 3), dtype=np.uint8)
+    palette[:16] = PALETTE_16
+    levels = np.array([0, 95, 135, 175, 215, 255], dtype=np.uint8)
+    r, g, b = np.meshgrid(levels, levels, levels, indexing="ij")
+    palette[16:232] = np.stack([r.ravel(), g.ravel(), b.ravel()], axis=1) # 6x6x6 color cube
+    palette[232:] = (8 + 10 * np.arange(24))[:, np.newaxis] # grayscale ramp
+    return palette
+
+PALETTE_256 = _xterm_256_palette()
+""" The xterm 256-color palette: the 16 ANSI colors, a 6x6x6 color cube and a 24-step grayscale ramp. """
+
+LUT_BITS = 5
+""" Bits per channel kept when looking colors up in the quantization tables (32x32x32 entries). """
+
+_luts: Dict[str, np.ndarray] = {}
+
+def palette_of(color_mode: ColorMode) -> np.ndarray:
+    """ Returns the (n, 3) rgb palette used by `color_mode` ("256" or "16"). """
+    return PALETTE_256 if color_mode == "256" else PALETTE_16
+
+def _build_lut(color_mode: ColorMode) -> np.ndarray:
+    """ For every cell of the quantized rgb cube, the index of the nearest palette color (by squared rgb distance). """
+    palette = palette_of(color_mode).astype(np.int32)
+    # the 16 ANSI colors are themeable, so in 256-color mode only the cube and grayscale ramp are used
+    candidates = np.arange(16, 256) if color_mode == "256" else np.arange(16)
+
+    step = 1 << (8 - LUT_BITS)
+    centers = np.arange(1 << LUT_BITS) * step + step // 2
+    r, g, b = np.meshgrid(centers, centers, centers, indexing="ij")
+    cube = np.stack([r.ravel(), g.ravel(), b.ravel()], axis=1)
+
+    # |c - p|^2 = |c|^2 - 2c.p + |p|^2, and |c|^2 doesn't change which p is nearest
+    targets = palette[candidates]
+    lut = np.empty(len(cube), dtype=np.uint8)
+    for start in range(0, len(cube), 4096): # chunked to keep the distance matrix small
+        chunk = cube[start:start+4096]
+        distances = (targets ** 2).sum(axis=1) - 2 * chunk @ targets.T
+        lut[start:start+4096] = candidates[np.argmin(distances, axis=1)]
+    return lut
+
+def quantize(pixels: np.ndarray, color_mode: ColorMode) -> np.ndarray:
+    """
+    Maps a (..., 3) array of rgb colors to the nearest colors of the `color_mode` ("256" or "16") palette.
+    Returns a (...) array of palette indices.
+
+    Done with a single gather from a precomputed lookup table (built the first time a mode is used).
+    """
+    lut = _luts.get(color_mode)
+    if lut is None:
+        lut = _luts[color_mode] = _build_lut(color_mode)
+
+    shift = 8 - LUT_BITS
+    channels = pixels >> shift
+    flat_index = (channels[..., 0].astype(np.intp) << (2 * LUT_BITS)) | (channels[..., 1].astype(np.intp) << LUT_BITS) | channels[..., 2]
+    return lut[flat_index]
@@ -12,4 +12,10 @@ Anchor = Literal[
 	"bottom",
 	"left",
 	"right"
-]
\ No newline at end of file
+]
+ColorMode = Literal["truecolor", "256", "16"]
+""" How colors are sent to the terminal: 24-bit rgb codes, the xterm 256-color palette, or the 16 ANSI colors. """
+CellMode = Literal["half", "quadrant", "sextant", "braille"]
+""" How many pixels go in one character cell: 1x2 half blocks, 2x2 quadrants, 2x3 sextants or 2x4 braille dots. """
+GradientDirection = Literal["horizontal", "vertical", "diagonal", "radial"]
+""" Which way a gradient goes: left to right, top to bottom, top left to bottom right corner, or from the center out. """
@@ -1,7 +1,9 @@
 import numpy as np
-from skimage.draw import line, disk
-from .pixelterm_types import Anchor, RGBTuple, Tuple
+from math import isqrt
+from .pixelterm_types import Anchor, RGBTuple, RGBATuple, Tuple
 from os import get_terminal_size
+from .output import default_sink
+from .color_cache import color_codes
 
 def term_width() -> int:
     """ Returns the width in cols (pixels) of the terminal. """
@@ -24,10 +26,9 @@ def move_xy(x: int, y: int) -> str:
 	return f"\033[{y+1};{x+1}H"
 
 def betterprint(text: str) -> None:
-    """ uses sys.stdout.write to write text to the terminal without a newline, infinitesimally faster than print?
-    Also doesnt add a color reset code at the end just for micro-optimization (i think). """
-    #sys.stdout.write(text)
-    print("\r" + text, end="")
+    """ Writes text to the terminal through the default `OutputSink` (no newline, no carriage return, no color reset).
+    Frames don't go through here anymore, they write their encoded bytes to a sink directly. """
+    default_sink.send(text.encode())
     
 def fcode(fg: RGBTuple = None, bg: RGBTuple = None) -> str:
     '''
@@ -40,14 +41,16 @@ def fcode(fg: RGBTuple = None, bg: RGBTuple = None) -> str:
     using whatever color code was previously set (if none previously set
     or colors were reset by printing something like `\x1b[0m` or `\033[0m`,
     will use default terminal colors).
+    
+    Codes are looked up in `color_cache.color_codes`, so each color only gets formatted once.
     '''
     
     format_str = ''
     
     if fg is not None:
-        format_str += '\033[38;2;{};{};{}m'.format(*fg)
+        format_str += color_codes.get(fg, True).decode()
     if bg is not None:
-        format_str += '\033[48;2;{};{};{}m'.format(*bg)
+        format_str += color_codes.get(bg, False).decode()
         
     return format_str
 
@@ -177,69 +180,183 @@ def text_style(foreground: str | tuple[int] = None, background: str | tuple[int]
     
     return format_str
 
-def blend_rgba_img_onto_rgb_img(original: np.ndarray, new: np.ndarray) -> np.ndarray:
+def blend_rgba_img_onto_rgb_img(original: np.ndarray, new: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
     """
     Blends two entire 2D arrays of pixels (so, techincally, 3D arrays) together, expecting
     that the original image is fully opaque and the new image has transparency. If the new
     image is RGB-based (no alpha, 3 channels), it will be treated as fully opaque.
     
     Will clip the new image to the size of the original image, anchoring the top left corner.
-    """
     
-    # if the new image has no alpha, just return the new image
+    The result is written to `out` (same shape and dtype as `original`, can be `original` itself to blend in place)
+    and returned. If `out` is None, a new array is allocated for it.
+    """
+    if out is None:
+        out = original.copy()
+    elif out is not original:
+        np.copyto(out, original)
+    _blend_into(out, new)
+    return out
+
+def blend_rgba_img_onto_rgb_img_inplace(original: np.ndarray, new: np.ndarray) -> None:
+    """ Same as `blend_rgba_img_onto_rgb_img`, but modifies the original array in place. """
+    _blend_into(original, new)
+
+def blend_rgba_color_onto_rgb_img_inplace(original: np.ndarray, color: RGBTuple | RGBATuple) -> None:
+    """ Blends a single rgb or rgba color over every pixel of `original`, in place. Same rounding as `blend_rgba_img_onto_rgb_img`. """
+    # plain ints, so numpy scalars, arrays and float channels work like they did when filled through a uint8 array
+    alpha = int(color[3]) if len(color) == 4 else 255
+    rgb = np.asarray(color[:3]).astype(np.uint16)
+    if alpha == 255:
+        original[...] = rgb
+    elif alpha > 0:
+        # the color's share is the same for every pixel, so it's folded into the rounding constant
+        blended = np.multiply(original, 255 - alpha, dtype=np.uint16)
+        blended += rgb * alpha + 128
+        blended += blended >> 8
+        blended >>= 8
+        np.copyto(original, blended, casting="unsafe")
+
+SMALL_BLEND = 1024
+""" Images with fewer pixels than this are blended straight away: for small sprites, checking for the fast paths costs more than it saves. """
+
+def _blend_into(target: np.ndarray, new: np.ndarray) -> None:
+    """
+    Blends `new` onto the top left of a uint8 rgb `target`, in place.
+
+    All integer: `(new * alpha + target * (255 - alpha)) / 255` is computed in uint16 and rounded to the nearest
+    integer with shifts (exact for every input). From `SMALL_BLEND` pixels up, fully transparent and fully opaque images
+    skip the arithmetic, and images with no partially transparent pixels at all (like text) are a bitwise select.
+    """
+    # the integer math below needs uint8, images built without a dtype (np.full, np.array...) are int64
+    new = np.asarray(new)[:target.shape[0], :target.shape[1]].astype(np.uint8, copy=False)
+    if new.shape[0] == 0 or new.shape[1] == 0:
+        return
+    target = target[:new.shape[0], :new.shape[1]]
+
     if new.shape[2] == 3:
-        return new
-    
-    clipped_new = new[:original.shape[0], :original.shape[1]]
-    
-    # if new image has 0 in any shape, return
-    if clipped_new.shape[0] == 0 or clipped_new.shape[1] == 0:
-        return original
+        np.copyto(target, new)
+        return
+    if new.shape[0] * new.shape[1] < SMALL_BLEND:
+        _blend_fixed_point(target, new[..., :3], new[..., 3:])
+        return
 
-    new_rgb = clipped_new[..., :3] # "img" without alpha
-    new_alpha = clipped_new[..., 3] / 255.0 # array of just the alpha values
-    # blend arrays in PARALLEL (yayyyyyyyy!!!!) 
-    
-    blended_rgb = new_rgb*new_alpha[..., np.newaxis] + original*(1 - new_alpha[..., np.newaxis])
+    alpha_plane = new[..., 3]
+    lowest, highest = alpha_plane.min(), alpha_plane.max()
+    if highest == 0:
+        return
+    if lowest == 255:
+        # one channel at a time: no copy of `new`, and numpy is a lot slower at copying 3 of every 4 bytes in one go
+        for channel in range(3):
+            np.copyto(target[..., channel], new[..., channel])
+        return
+    # contiguous copies: the math below is several times faster on them than on every 4th byte of `new`
+    rgb = np.take(new, (0, 1, 2), axis=2)
+    alpha = np.repeat(alpha_plane, 3).reshape(rgb.shape)
 
-    # return as uint8 types since this returns floats
-    return blended_rgb.astype(np.uint8)
+    # 0 wraps around to 255 here, so only alphas 1-254 are below 254
+    if not ((alpha_plane - np.uint8(1)) < 254).any():
+        # every alpha is 0 or 255, so it works as a bitmask: target ^ ((target ^ rgb) & alpha) picks rgb where it's 255
+        rgb ^= target
+        rgb &= alpha
+        target ^= rgb
+        return
+    _blend_fixed_point(target, rgb, alpha)
 
-def blend_rgba_img_onto_rgb_img_inplace(original: np.ndarray, new: np.ndarray) -> None:
-    """ Same as `blend_rgba_img_onto_rgb_img`, but modifies the original array in place. """
-    original[:] = blend_rgba_img_onto_rgb_img(original, new)
+def _blend_fixed_point(target: np.ndarray, rgb: np.ndarray, alpha: np.ndarray) -> None:
+    blended = np.multiply(rgb, alpha, dtype=np.uint16)
+    scratch = np.multiply(target, 255 - alpha, dtype=np.uint16)
+    blended += scratch
+    # round(x / 255) == (x + 128 + ((x + 128) >> 8)) >> 8 for every x up to 255 * 255
+    blended += 128
+    np.right_shift(blended, 8, out=scratch)
+    blended += scratch
+    blended >>= 8
+    np.copyto(target, blended, casting="unsafe")
 
-def draw_line(image: np.ndarray, pos1: tuple, pos2: tuple, color: RGBTuple, width: int = 1) -> None:
+def draw_line(image: np.ndarray, pos1: tuple, pos2: tuple, color: RGBTuple, width: int = 1) -> Tuple[int, int, int, int] | None:
     """
     draw a fully opaque line of color `color` on the image from pos1= (x1, y1) to pos2= (x2, y2).
-    modifies `image` in place, does not return anything.
+    modifies `image` in place. Returns the (left, top, right, bottom) bounds of what was drawn, None if it's all off the image.
     """
-    
-    x1, y1 = pos1
-    x2, y2 = pos2
-    
-    # Get the coordinates of the line
-    rr, cc = line(y1, x1, y2, x2)
+    return draw_lines(image, [(pos1, pos2)], color, width)
 
-    # Clip the coordinates to be within the image dimensions
-    rr_clipped = np.clip(rr, 0, image.shape[0]-1)
-    cc_clipped = np.clip(cc, 0, image.shape[1]-1)
-    
-    # for all the rrs that were clipped off, remove the corresponding ccs, otherwise it creates a flat line at the edge
-    rr_diffs = rr - rr_clipped
-    cc_clipped = cc_clipped[rr_diffs == 0]
-    
-    #cc_diffs = cc - cc_clipped
-    #rr_clipped = rr_clipped[cc_diffs == 0]
+def draw_lines(image: np.ndarray, segments, color: RGBTuple, width: int = 1) -> Tuple[int, int, int, int] | None:
+    """
+    Draws every ((x1, y1), (x2, y2)) line segment in `segments` (any sequence, or an (n, 2, 2) array) onto `image`, all at once.
 
-    for r, c in zip(rr, cc):
-        rr_disk, cc_disk = disk((r, c), radius=width)
-        
-        # Clip the coordinates to be within the image dimensions
-        rr_disk = np.clip(rr_disk, 0, image.shape[0] - 1)
-        cc_disk = np.clip(cc_disk, 0, image.shape[1] - 1)
-        
-        image[rr_disk, cc_disk] = color
+    Every point of a line (see `_line_points`) is the center of a disk of radius `width` (pixels strictly closer than `width`,
+    like `skimage.draw.disk`), so width 1 is a 1 pixel line. Instead of drawing each disk, the points of all segments are
+    put in one mask, which is grown by the disk in a few whole-array operations (see `_dilate`) and painted in a single assignment.
+    Parts of lines that are off the image are clipped away.
+
+    Returns the (left, top, right, bottom) bounds of what was drawn, None if it's all off the image.
+    """
+    segments = np.asarray(segments, dtype=np.int64).reshape(-1, 2, 2)
+    if len(segments) == 0 or width < 1:
+        return None
+    rr, cc = _line_points(segments[:, 0, 1], segments[:, 0, 0], segments[:, 1, 1], segments[:, 1, 0])
+
+    # the part of the image the lines can reach
+    reach = width - 1
+    top, bottom = max(int(rr.min()) - reach, 0), min(int(rr.max()) + reach + 1, image.shape[0])
+    left, right = max(int(cc.min()) - reach, 0), min(int(cc.max()) + reach + 1, image.shape[1])
+    if top >= bottom or left >= right:
+        return None
+
+    # points up to `reach` outside of that part still paint into it, so the mask has a margin of `reach` all around
+    rr, cc = rr - (top - reach), cc - (left - reach)
+    shape = (bottom - top + 2 * reach, right - left + 2 * reach)
+    inside = (rr >= 0) & (rr < shape[0]) & (cc >= 0) & (cc < shape[1])
+    mask = np.zeros(shape, dtype=bool)
+    mask[rr[inside], cc[inside]] = True
+
+    mask = _dilate(mask, width)[reach:reach + bottom - top, reach:reach + right - left]
+    image[top:bottom, left:right][mask] = color
+    return left, top, right, bottom
+
+def _line_points(r0: np.ndarray, c0: np.ndarray, r1: np.ndarray, c1: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The (rows, cols) of the pixels of every line from (r0, c0) to (r1, c1), concatenated. Same pixels as `skimage.draw.line`
+    (Bresenham), but for all lines at once: along the longer axis, the i-th point of a line with n steps is moved
+    `floor((2 * shorter * i + n) / (2 * n))` steps along the shorter one.
+    """
+    dr, dc = r1 - r0, c1 - c0
+    steps = np.maximum(np.abs(dr), np.abs(dc))
+    counts = steps + 1
+    line = np.repeat(np.arange(len(counts)), counts)
+    i = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    n = np.maximum(steps, 1)[line]
+    moves = lambda delta: np.sign(delta)[line] * ((2 * np.abs(delta)[line] * i + n) // (2 * n))
+    return r0[line] + moves(dr), c0[line] + moves(dc)
+
+def _dilate(mask: np.ndarray, radius: int) -> np.ndarray:
+    """
+    Every pixel strictly closer than `radius` to a set pixel of `mask`, as a new mask (the same pixels as drawing a disk
+    of `radius` around each of them). The disk is cut into rows: each row is a horizontal run, done for the whole mask at once
+    with prefix sums, then shifted into place. So it's 2 * radius - 1 whole-mask operations, no matter how many pixels are set.
+    """
+    if radius <= 1:
+        return mask
+    height, width = mask.shape
+    sums = np.zeros((height, width + 1), dtype=np.int32)
+    np.cumsum(mask, axis=1, out=sums[:, 1:])
+    cols = np.arange(width)
+
+    dilated = np.zeros_like(mask)
+    runs = {}
+    for dr in range(-(radius - 1), radius):
+        half = isqrt(radius * radius - dr * dr - 1) # the widest dc with dr^2 + dc^2 < radius^2
+        if half not in runs:
+            # whether any pixel within `half` columns is set
+            runs[half] = sums[:, np.minimum(cols + half + 1, width)] > sums[:, np.maximum(cols - half, 0)]
+        # every pixel `dr` rows below a set run
+        if dr >= 0:
+            dilated[dr:] |= runs[half][:height - dr]
+        else:
+            dilated[:dr] |= runs[half][-dr:]
+    return dilated
 
 def adjust_for_anchor(x: int, y: int, size_x: int, size_y: int, target_anchor: Anchor) -> Tuple[int, int]:
     """
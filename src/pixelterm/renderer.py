@@ -0,0 +1,137 @@
+import numpy as np
+from collections import deque
+from typing import Callable, Deque, Literal, Tuple
+from .blocks import CELL_SHAPES
+from .frame import PixeltermFrame
+from .output import OutputSink
+from .stats import RenderStats, draw_stats_hud
+from .pixelterm_types import RGBTuple, ColorMode, CellMode
+
+class Renderer:
+    """
+    Double-buffered screen. Keeps the frame that is currently displayed (front buffer) and
+    the one being drawn (back buffer), so a render loop doesn't have to allocate a new `PixeltermFrame`
+    every frame or keep track of the previous one by hand.
+
+    ```python
+    renderer = Renderer()
+    while True:
+        frame = renderer.frame # the back buffer
+        frame.add_rect((255, 0, 0), x, y, 10, 10)
+        renderer.present() # diff against what's on screen, write, swap buffers
+    ```
+    """
+
+    front: PixeltermFrame
+    """ What is currently on screen. Should not be drawn on. """
+    back: PixeltermFrame
+    """ The frame being drawn, shown on the next `present()`. Also available as `Renderer.frame`. """
+    sink: OutputSink | None
+    """ Where frames are written to. None writes to stdout (see `OutputSink`). """
+
+    def __init__(
+        self,
+        size: Tuple[int | None, int | None] = (None, None),
+        pos: Tuple[int | None, int | None] = (0, 0),
+        color_mode: ColorMode = "truecolor",
+        sink: OutputSink | None = None,
+        clear_color: RGBTuple | None = (0, 0, 0),
+        preserve: bool = False,
+        synchronized: bool = False,
+        tolerance: float = 0,
+        tolerance_metric: Literal["channel", "perceptual"] = "channel",
+        max_bytes: int | None = None,
+        cell_mode: CellMode = "half",
+        scroll: bool = False,
+        on_stats: Callable[[RenderStats], None] | None = None,
+        stats_history: int = 0,
+        hud: bool = False,
+        ) -> None:
+        """ Optional params:
+        - `size`, `pos`, `color_mode`: same as for `PixeltermFrame`. None sizes default to the terminal's width/height.
+        - `sink`: where to write frames, defaults to stdout.
+        - `clear_color`: after every `present()`, the new back buffer is filled with this color, just like a freshly created frame (black).
+        Set to None if every frame gets redrawn completely anyway, to skip the fill.
+        - `preserve`: if True, the new back buffer instead starts out as a copy of what was just presented,
+        so frames can be drawn incrementally on top of the previous one. Overrides `clear_color`.
+        - `synchronized`: wrap every frame in a DEC synchronized update (see `OutputSink.send`), so the terminal never shows a half-drawn frame.
+        - `tolerance`, `tolerance_metric`: lossy diffing (truecolor only, see `PixeltermFrame.render`). Cells that are within
+        `tolerance` of what is on screen are not redrawn. Good for noisy sources like video, where it saves a lot of bytes for
+        changes nobody can see. The front buffer then holds what is actually displayed, so errors never add up past `tolerance`.
+        - `max_bytes`: byte budget per frame (see `PixeltermFrame.render`). A scene change then converges over a few frames,
+        most visibly wrong cells first, instead of one huge frame that takes several intervals to reach the terminal.
+        - `cell_mode`: same as for `PixeltermFrame`.
+        - `scroll`: move content that scrolled up or down with the terminal's scroll commands instead of redrawing it
+        (see `PixeltermFrame.render`). Only for frames that span the full terminal width, and only used without `tolerance` and `max_bytes`.
+        With `preserve`, the whole frame is then checked for scrolling instead of only what was drawn (see `PixeltermFrame.damage`).
+        - `on_stats`: called with the `RenderStats` of every `present()` (timings, bytes, cells and codes sent).
+        - `stats_history`: how many of the latest `RenderStats` to keep in `stats`. 0 (default) doesn't keep any.
+        - `hud`: draw the average stats of `stats` over the top left corner of every frame, right before it's presented.
+        Keeps the last 60 frames if `stats_history` isn't set. With `preserve`, whatever was under the overlay is lost.
+        """
+        self.sink = sink
+        self.clear_color = clear_color
+        self.preserve = preserve
+        self.synchronized = synchronized
+        self.tolerance = tolerance
+        self.tolerance_metric = tolerance_metric
+        self.max_bytes = max_bytes
+        self.scroll = scroll
+        self.on_stats = on_stats
+        self.hud = hud
+        self.stats: Deque[RenderStats] = deque(maxlen=stats_history or (60 if hud else 0))
+        """ The `RenderStats` of the latest frames presented, oldest first. """
+        self._pos = pos
+        self._color_mode = color_mode
+        self._cell_mode = cell_mode
+        self.resize(size)
+
+    @property
+    def frame(self) -> PixeltermFrame:
+        """ The back buffer, to draw the next frame on. """
+        return self.back
+
+    def resize(self, size: Tuple[int | None, int | None] = (None, None)) -> None:
+        """ (Re)allocates both buffers with the given size (None = terminal size). The next `present()` redraws the whole screen. """
+        self.back = PixeltermFrame(size, self._pos, self._color_mode, self._cell_mode)
+        self.front = PixeltermFrame((self.back.width, self.back.height), self._pos, self._color_mode, self._cell_mode)
+        self._front_valid = False
+
+    def invalidate(self) -> None:
+        """ Forget what's on screen, so the next `present()` redraws everything.
+        Use this if something else drew over the terminal (e.g. it was cleared, or text was printed). """
+        self._front_valid = False
+
+    def _record_stats(self, stats: RenderStats) -> None:
+        self.stats.append(stats)
+        if self.on_stats is not None:
+            self.on_stats(stats)
+
+    def present(self) -> None:
+        """ Renders the back buffer, diffed against what is on screen, then swaps the buffers. Doesn't allocate any frames. """
+        if self.hud:
+            draw_stats_hud(self.back, self.stats)
+        painted = self.back.render(
+            self.front if self._front_valid else None, self.sink, self.synchronized, 
+            self.tolerance, self.tolerance_metric, self.max_bytes, self.scroll,
+            self._record_stats if self.on_stats is not None or self.stats.maxlen else None,
+        )
+        self._front_valid = True
+
+        if painted is not None and (self.tolerance > 0 or self.max_bytes is not None):
+            # lossy: the screen is only partially updated, copy exactly the cells that were drawn into the front buffer.
+            # the back buffer still holds the frame as it was drawn (which is what `preserve` wants)
+            cell_height, cell_width = CELL_SHAPES[self._cell_mode]
+            painted_pixels = np.repeat(np.repeat(painted, cell_height, axis=0), cell_width, axis=1)
+            np.copyto(self.front.pixels, self.back.pixels, where=painted_pixels[..., np.newaxis])
+            self.back.damage = None # the front buffer isn't what the back buffer was drawn on top of anymore
+            if not self.preserve and self.clear_color is not None:
+                self.back.pixels[:] = self.clear_color
+            return
+
+        self.front, self.back = self.back, self.front
+        if self.preserve:
+            np.copyto(self.back.pixels, self.front.pixels)
+            self.back.reset_damage(self.front) # so the next present() only diffs what gets drawn on top
+        elif self.clear_color is not None:
+            self.back.pixels[:] = self.clear_color
@@ -0,0 +1,98 @@
+from time import perf_counter, sleep
+from typing import Callable, Iterator, NamedTuple
+
+class FrameReport(NamedTuple):
+    """ How one frame went, reported by `FrameScheduler` once the frame is done. """
+    frame_number: int
+    """ Index of the frame that was produced. """
+    work_time: float
+    """ Seconds between the frame being handed out and the caller asking for the next one (drawing + rendering). """
+    missed_deadlines: int
+    """ How many frame deadlines passed while producing this frame. 0 = on time. """
+
+class FrameScheduler:
+    """
+    Paces a render loop to a fixed frame rate, without busy-waiting.
+
+    Iterating over the scheduler yields the number of the frame to produce. Before yielding, it sleeps until that
+    frame's deadline (`start + frame_number / fps`). If producing a frame took longer than one frame interval,
+    the frames whose deadlines already passed are dropped (skipped), so playback stays in sync with the clock
+    (e.g. with audio) instead of slowing down.
+
+    ```python
+    renderer = Renderer(synchronized=True) # no half-drawn frames
+    for frame_number in FrameScheduler(30, max_frames=len(video)):
+        renderer.frame.add_image_from_pixels(video[frame_number], 0, 0)
+        renderer.present()
+    ```
+    """
+
+    def __init__(
+        self,
+        fps: float,
+        max_frames: int | None = None,
+        drop_frames: bool = True,
+        on_report: Callable[[FrameReport], None] | None = None,
+        spin: float = 0.0005,
+        ) -> None:
+        """ Params:
+        - `fps`: target frame rate.
+        - `max_frames`: stop once the frame number reaches this. None = run until the loop is broken out of.
+        - `drop_frames`: skip frames whose deadline already passed. If False, every frame number is yielded (playback slows down instead).
+        - `on_report`: called with a `FrameReport` after every frame.
+        - `spin`: the last `spin` seconds before a deadline are busy-waited instead of slept, since
+        OS sleeps can overshoot by a fraction of a millisecond. 0 to always sleep.
+        """
+        assert fps > 0, f"[FrameScheduler/__init__]: fps must be positive, instead got {fps}"
+
+        self.interval = 1 / fps
+        """ Seconds per frame. """
+        self.max_frames = max_frames
+        self.drop_frames = drop_frames
+        self.on_report = on_report
+        self.spin = spin
+
+        self.frames_presented = 0
+        """ Number of frames yielded so far. """
+        self.frames_dropped = 0
+        """ Number of frames skipped because producing the previous ones took too long. """
+        self.deadline_misses = 0
+        """ Number of frames that weren't done before the next frame's deadline. """
+        self.start_time: float | None = None
+        """ `perf_counter()` time of frame 0's deadline, set when iteration starts. """
+
+    def wait_until(self, deadline: float) -> None:
+        """ Sleeps until `perf_counter()` reaches `deadline`. """
+        remaining = deadline - perf_counter()
+        if remaining > self.spin:
+            sleep(remaining - self.spin)
+        while perf_counter() < deadline:
+            pass
+
+    def __iter__(self) -> Iterator[int]:
+        self.start_time = perf_counter()
+        frame_number = 0
+
+        while self.max_frames is None or frame_number < self.max_frames:
+            self.wait_until(self.start_time + frame_number * self.interval)
+
+            handed_out = perf_counter()
+            yield frame_number
+            done = perf_counter()
+
+            self.frames_presented += 1
+
+            # the next frame is due at start + (n+1)*interval; count every deadline this frame ran past
+            next_frame_number = frame_number + 1
+            due_frame_number = int((done - self.start_time) / self.interval)
+            missed = max(0, due_frame_number - frame_number)
+            if missed:
+                self.deadline_misses += 1
+                if self.drop_frames and due_frame_number > next_frame_number:
+                    self.frames_dropped += due_frame_number - next_frame_number
+                    next_frame_number = due_frame_number
+
+            if self.on_report is not None:
+                self.on_report(FrameReport(frame_number, done - handed_out, missed))
+
+            frame_number = next_frame_number
@@ -0,0 +1,67 @@
+import numpy as np
+from typing import Tuple
+
+MIN_SCROLL_GAIN = 2
+""" A shift is only used if it lines up at least this many more character rows with the previous frame than not shifting does. """
+
+def row_hashes(pixels: np.ndarray, cell_height: int = 2) -> np.ndarray:
+    """ Hash of every character row (`cell_height` pixel rows) of a frame, as a (rows,) int64 array. """
+    rows = pixels.shape[0] // cell_height
+    flat = pixels.reshape(rows, -1)
+    return np.array([hash(row.tobytes()) for row in flat], dtype=np.int64)
+
+def detect_scroll(hashes: np.ndarray, prev_hashes: np.ndarray) -> Tuple[int, int, int] | None:
+    """
+    Looks for a vertical shift between two frames, from their `row_hashes`.
+
+    Every pair of equal rows votes for the shift that would line them up, and the shift with the most votes wins.
+    Returns `(top, bottom, shift)`: the band of character rows [top, bottom) to scroll, and by how many rows
+    (positive = content moved up, so new row r shows what was in row r + shift). None if no shift beats not scrolling.
+    """
+    rows = hashes.size
+    new_rows, old_rows = np.nonzero(hashes[:, np.newaxis] == prev_hashes[np.newaxis, :])
+    offsets = old_rows - new_rows
+    votes = np.bincount(offsets + rows - 1, minlength=2 * rows - 1)
+
+    unshifted = votes[rows - 1]
+    votes[rows - 1] = 0
+    best = int(np.argmax(votes))
+    if votes[best] < unshifted + MIN_SCROLL_GAIN:
+        return None
+
+    # the band spans every row that lines up with the shift, plus the rows that get scrolled in
+    shift = best - (rows - 1)
+    matched = new_rows[offsets == shift]
+    if shift > 0:
+        top, bottom = int(matched.min()), min(rows, int(matched.max()) + 1 + shift)
+    else:
+        top, bottom = int(matched.min()) + shift, int(matched.max()) + 1
+    if bottom - top < 2 or abs(shift) >= bottom - top:
+        return None
+    return top, bottom, shift
+
+def exposed_rows(top: int, bottom: int, shift: int) -> Tuple[int, int]:
+    """ The [start, end) character rows that scrolling the band [top, bottom) by `shift` leaves blank. """
+    return (bottom - shift, bottom) if shift > 0 else (top, top - shift)
+
+def shift_rows(pixels: np.ndarray, top: int, bottom: int, shift: int, cell_height: int = 2) -> np.ndarray:
+    """
+    What the screen shows after scrolling a frame's character rows [top, bottom) by `shift` (see `detect_scroll`), as a new array.
+    The rows that got scrolled in (see `exposed_rows`) are left as they were, they have to be repainted anyway.
+    """
+    shifted = pixels.copy()
+    top, bottom = top * cell_height, bottom * cell_height
+    distance = abs(shift) * cell_height
+    if shift > 0:
+        shifted[top:bottom - distance] = pixels[top + distance:bottom]
+    else:
+        shifted[top + distance:bottom] = pixels[top:bottom - distance]
+    return shifted
+
+def scroll_codes(top: int, bottom: int, shift: int) -> bytes:
+    """
+    Escape codes that scroll the 0-indexed terminal lines [top, bottom) by `shift` lines: set the scroll region (DECSTBM),
+    scroll up (SU) or down (SD), then reset the scroll region to the whole screen.
+    Scroll regions always span whole lines, so everything else on those lines moves too.
+    """
+    return f"\033[{top + 1};{bottom}r\033[{abs(shift)}{'S' if shift > 0 else 'T'}\033[r".encode()
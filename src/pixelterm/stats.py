@@ -0,0 +1,86 @@
+import numpy as np
+from time import perf_counter
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+from .font import Font
+from .pixelterm_types import RGBTuple, RGBATuple
+
+if TYPE_CHECKING:
+    from .frame import PixeltermFrame
+
+class RenderStats(NamedTuple):
+    """ How one `PixeltermFrame.render()` went. Passed to its `on_stats` callback, and kept by `Renderer` (see `Renderer.stats`). """
+    diff_time: float
+    """ Seconds spent finding what changed: row rejection, scroll detection, and the per-cell diff (including the color conversion it compares). """
+    encode_time: float
+    """ Seconds spent turning the changed cells into bytes. For a full redraw, that's all of it. """
+    write_time: float
+    """ Seconds spent handing the bytes to the sink. For a `ThreadedSink` that's only queueing them, not the actual write. """
+    bytes_written: int
+    """ Number of bytes sent. """
+    cells_painted: int
+    """ Number of character cells drawn (every cell of the frame for a full redraw). """
+    sgr_codes: int
+    """ Number of color codes sent. The fg and bg codes count separately. """
+    cursor_moves: int
+    """ Number of cursor moves sent. """
+    full_redraw: bool
+    """ Whether the whole frame was drawn, instead of a diff. """
+
+    @property
+    def total_time(self) -> float:
+        """ diff + encode + write, in seconds. """
+        return self.diff_time + self.encode_time + self.write_time
+
+    @classmethod
+    def measure(cls, encoded: bytes, painted: np.ndarray | None, cells: int, timer: "RenderTimer") -> "RenderStats":
+        """
+        Stats for the bytes of one render, and the mask of the cells painted (None for a full redraw of `cells` cells).
+        Codes are counted straight from the bytes: glyphs are all multibyte UTF-8 (or spaces), so the only `m` and `H` bytes in there end SGR codes and cursor moves.
+        """
+        return cls(
+            timer.diff, timer.encode, timer.write, len(encoded),
+            cells if painted is None else int(np.count_nonzero(painted)),
+            encoded.count(b"m"), encoded.count(b"H"), painted is None,
+        )
+
+class RenderTimer:
+    """ Splits the time spent in a render into its stages. Every `lap()` adds the time since the previous one to a stage. """
+
+    def __init__(self) -> None:
+        self.diff = 0.0
+        self.encode = 0.0
+        self.write = 0.0
+        self._last = perf_counter()
+
+    def lap(self, stage: str) -> None:
+        """ Adds the time since the last lap (or since the timer was created) to `stage`: "diff", "encode" or "write". """
+        now = perf_counter()
+        setattr(self, stage, getattr(self, stage) + now - self._last)
+        self._last = now
+
+def draw_stats_hud(
+    frame: "PixeltermFrame",
+    history: Iterable[RenderStats],
+    x: int = 1, y: int = 1,
+    color: RGBTuple = (255, 255, 255),
+    background: RGBTuple | RGBATuple = (0, 0, 0, 160),
+    ) -> None:
+    """
+    Draws a small overlay of the average render stats in `history` onto `frame`, at (x, y) in pixels:
+    diff, encode and write time in milliseconds, then the kB and cells drawn per frame. Does nothing if `history` is empty.
+    """
+    history = list(history)
+    if not history:
+        return
+    average = lambda field: sum(getattr(stats, field) for stats in history) / len(history)
+
+    lines = [
+        f"d{average('diff_time') * 1e3:.1f} e{average('encode_time') * 1e3:.1f} w{average('write_time') * 1e3:.1f}ms",
+        f"{average('bytes_written') / 1e3:.1f}kB {average('cells_painted'):.0f}c",
+    ]
+    font = Font.font1
+    line_height = font.get_height() + 2
+    width = font.get_width_of(max(len(line) for line in lines)) + 2
+    frame.add_rect(background, x, y, width, line_height * len(lines))
+    for i, line in enumerate(lines):
+        frame.add_large_text(x + 1, y + 1 + i * line_height, font, line, color=color)
@@ -0,0 +1,199 @@
+import re
+import numpy as np
+from typing import List
+from .blocks import CELL_GLYPHS, CELL_SHAPES
+from .palette import PALETTE_16, PALETTE_256
+from .pixelterm_types import CellMode, RGBTuple
+
+DEFAULT_FG: RGBTuple = (255, 255, 255)
+""" The fg color the terminal starts with (and goes back to on `\\033[0m` / `\\033[39m`). """
+DEFAULT_BG: RGBTuple = (0, 0, 0)
+""" The bg color the terminal starts with (and goes back to on `\\033[0m` / `\\033[49m`). """
+
+_CSI = re.compile(r"\033\[([0-9;?]*)([A-Za-z])")
+_TEXT = re.compile(r"[^\033\r\n]+")
+
+class VirtualTerminal:
+    """
+    Headless model of a terminal screen, for checking what rendered frames actually look like without a real terminal.
+
+    Bytes written with `feed()` (e.g. the output of `PixeltermFrame.encode()`, or an `io.BytesIO` used as an `OutputSink`)
+    are parsed into a grid of character cells, each with a glyph, a fg and a bg color. `pixels()` decodes that grid back into
+    a pixel array, so a test can check that `render(prev)` on top of `render_raw(prev)` shows exactly the new frame.
+
+    Understands what pixelterm emits: cursor moves (CSI H, `\\r`, `\\n`), SGR colors (truecolor, 256-color and the 16 ANSI colors,
+    defaults and resets), scroll regions and scrolling (DECSTBM, SU, SD). Other SGR attributes (bold, italic...) and private
+    modes (cursor visibility, synchronized updates) are accepted and ignored. Anything else raises a ValueError, so new codes
+    in the encoder can't go unnoticed.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        """ `width` and `height`: size of the screen in character cells. """
+        self.width = width
+        self.height = height
+        self.chars = np.full((height, width), " ", dtype="<U1")
+        """ The glyph in every cell, as a (height, width) array. """
+        self.fg = np.empty((height, width, 3), dtype=np.uint8)
+        """ The fg color of every cell, as a (height, width, 3) array. """
+        self.bg = np.empty((height, width, 3), dtype=np.uint8)
+        """ The bg color of every cell, as a (height, width, 3) array. """
+        self.fg[:] = DEFAULT_FG
+        self.bg[:] = DEFAULT_BG
+
+        self.x = 0
+        """ Cursor column (0-indexed). """
+        self.y = 0
+        """ Cursor row (0-indexed). """
+        self.fg_color: RGBTuple | None = DEFAULT_FG
+        """ The current fg color. None after `forget_colors()`, until an SGR code sets it. """
+        self.bg_color: RGBTuple | None = DEFAULT_BG
+        """ The current bg color. None after `forget_colors()`, until an SGR code sets it. """
+        self.scroll_region = (0, height)
+        """ The [top, bottom) rows that scroll, set by DECSTBM. """
+        self.bytes_fed = 0
+        """ Total number of bytes passed to `feed()`. """
+
+    def forget_colors(self) -> None:
+        """
+        Makes the current colors unknown, as if something else had printed to the terminal in between.
+        Printing anything before an SGR code sets the color it needs then raises a ValueError, which catches
+        encoders that rely on colors left over from an earlier frame.
+        """
+        self.fg_color = None
+        self.bg_color = None
+
+    def feed(self, data: bytes | str) -> None:
+        """ Applies everything in `data` to the screen, as a terminal would. """
+        if isinstance(data, bytes):
+            self.bytes_fed += len(data)
+            data = data.decode()
+        else:
+            self.bytes_fed += len(data.encode())
+
+        i = 0
+        while i < len(data):
+            char = data[i]
+            if char == "\033":
+                match = _CSI.match(data, i)
+                if match is None:
+                    raise ValueError(f"[VirtualTerminal/feed]: unsupported escape sequence {data[i:i+16]!r}")
+                self._csi(match.group(1), match.group(2))
+                i = match.end()
+            elif char == "\r":
+                self.x = 0
+                i += 1
+            elif char == "\n":
+                self._line_feed()
+                i += 1
+            else:
+                match = _TEXT.match(data, i)
+                self._print(match.group())
+                i = match.end()
+
+    def pixels(self, cell_mode: CellMode = "half") -> np.ndarray:
+        """
+        Decodes the screen into a (height * cell height, width * cell width, 3) rgb array, reading every glyph as a pattern of
+        `cell_mode` (see `blocks.CELL_GLYPHS`): fg where the pattern is drawn, bg everywhere else. A frame at `pos` with `size`
+        is then at `pixels[y:y+h, x:x+w]`, same as in its own `pixels`. Glyphs that aren't a pattern of `cell_mode` raise a ValueError.
+        """
+        cell_height, cell_width = CELL_SHAPES[cell_mode]
+        lookup = {glyph: mask for mask, glyph in enumerate(CELL_GLYPHS[cell_mode])}
+        try:
+            masks = np.array([[lookup[glyph] for glyph in row] for row in self.chars.tolist()], dtype=np.int64).reshape(self.height, self.width)
+        except KeyError as e:
+            raise ValueError(f"[VirtualTerminal/pixels]: {e.args[0]!r} is not a {cell_mode} glyph") from None
+
+        count = cell_height * cell_width
+        drawn = (masks[..., np.newaxis] >> np.arange(count) & 1).astype(bool)
+        cells = np.where(drawn[..., np.newaxis], self.fg[:, :, np.newaxis], self.bg[:, :, np.newaxis])
+        cells = cells.reshape(self.height, self.width, cell_height, cell_width, 3).transpose(0, 2, 1, 3, 4)
+        return cells.reshape(self.height * cell_height, self.width * cell_width, 3)
+
+    def _print(self, text: str) -> None:
+        for char in text:
+            # a space only shows the bg, and a full block only the fg, so those are fine with the other color unknown
+            if (self.fg_color is None and char != " ") or (self.bg_color is None and char != "█"):
+                raise ValueError(f"[VirtualTerminal/feed]: {char!r} printed before its colors were set")
+            if self.x >= self.width: # wraps like a terminal with autowrap on
+                self.x = 0
+                self._line_feed()
+            self.chars[self.y, self.x] = char
+            self.fg[self.y, self.x] = self.fg_color or DEFAULT_FG
+            self.bg[self.y, self.x] = self.bg_color or DEFAULT_BG
+            self.x += 1
+
+    def _line_feed(self) -> None:
+        if self.y == self.scroll_region[1] - 1:
+            self._scroll(1)
+        else:
+            self.y = min(self.y + 1, self.height - 1)
+
+    def _scroll(self, shift: int) -> None:
+        """ Scrolls the scroll region up by `shift` rows (down if negative). The rows scrolled in are blank, in the current bg. """
+        top, bottom = self.scroll_region
+        distance = min(abs(shift), bottom - top)
+        for grid in (self.chars, self.fg, self.bg):
+            if shift > 0:
+                grid[top:bottom - distance] = grid[top + distance:bottom].copy()
+            else:
+                grid[top + distance:bottom] = grid[top:bottom - distance].copy()
+
+        blank = slice(bottom - distance, bottom) if shift > 0 else slice(top, top + distance)
+        self.chars[blank] = " "
+        self.fg[blank] = DEFAULT_FG
+        self.bg[blank] = self.bg_color if self.bg_color is not None else DEFAULT_BG
+
+    def _csi(self, params: str, command: str) -> None:
+        if params.startswith("?"):
+            if command not in "hl":
+                raise ValueError(f"[VirtualTerminal/feed]: unsupported private sequence {params}{command}")
+            return # private modes don't change what's on screen
+        values = [int(value) if value else 0 for value in params.split(";")] if params else []
+
+        if command in "Hf":
+            row, col = (values + [0, 0])[:2]
+            self.y = min(max(row, 1), self.height) - 1
+            self.x = min(max(col, 1), self.width) - 1
+        elif command == "m":
+            self._sgr(values or [0])
+        elif command == "r":
+            top, bottom = (values + [0, 0])[:2]
+            top, bottom = max(top, 1) - 1, bottom or self.height
+            if bottom - top >= 2 and bottom <= self.height:
+                self.scroll_region = (top, bottom)
+            self.x, self.y = 0, 0
+        elif command in "ST":
+            shift = max(values[0] if values else 1, 1)
+            self._scroll(shift if command == "S" else -shift)
+        else:
+            raise ValueError(f"[VirtualTerminal/feed]: unsupported sequence CSI {params}{command}")
+
+    def _sgr(self, values: List[int]) -> None:
+        i = 0
+        while i < len(values):
+            code = values[i]
+            if code in (38, 48):
+                if values[i + 1] == 2:
+                    color, i = tuple(values[i + 2:i + 5]), i + 5
+                elif values[i + 1] == 5:
+                    color, i = tuple(PALETTE_256[values[i + 2]].tolist()), i + 3
+                else:
+                    raise ValueError(f"[VirtualTerminal/feed]: unsupported color code {values[i:]}")
+                if code == 38:
+                    self.fg_color = color
+                else:
+                    self.bg_color = color
+                continue
+
+            if code == 0:
+                self.fg_color, self.bg_color = DEFAULT_FG, DEFAULT_BG
+            elif code == 39:
+                self.fg_color = DEFAULT_FG
+            elif code == 49:
+                self.bg_color = DEFAULT_BG
+            elif 30 <= code <= 37 or 90 <= code <= 97:
+                self.fg_color = tuple(PALETTE_16[code - 30 if code < 90 else code - 82].tolist())
+            elif 40 <= code <= 47 or 100 <= code <= 107:
+                self.bg_color = tuple(PALETTE_16[code - 40 if code < 100 else code - 92].tolist())
+            # anything else is a text attribute (bold, italic...), which doesn't change the colors
+            i += 1
@@ -1,4 +1,5 @@
 from pixelterm.frame import PixeltermFrame
+from pixelterm.renderer import Renderer
 from time import sleep, perf_counter
 
 def test_gradient():
@@ -21,17 +22,15 @@ def test_animated_gradient():
 	color1 = (255, 0, 0)
 	color2 = (0, 255, 0)
 
-	prev = PixeltermFrame()
-	prev.fill_with_gradient(color1, color2)
-	prev.render_raw()
+	renderer = Renderer(clear_color=None)
+	renderer.frame.fill_with_gradient(color1, color2)
+	renderer.present()
 	frames_rendered += 1
 
 	while color1[0] != 0:
 		color1 = (color1[0]-1, color1[1], color1[2])
-		new_frame = PixeltermFrame()
-		new_frame.fill_with_gradient(color1, color2)
-		new_frame.render(prev)
-		prev = new_frame
+		renderer.frame.fill_with_gradient(color1, color2)
+		renderer.present()
 		frames_rendered += 1
 
 	end = perf_counter()
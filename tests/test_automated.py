@@ -1,5 +1,6 @@
 from unittest import TestCase
-from pixelterm import PixeltermFrame, term_height, term_width, adjust_for_anchor
+import numpy as np
+from pixelterm import PixeltermFrame, term_height, term_width, adjust_for_anchor, blend_rgba_img_onto_rgb_img
 
 class AutomatedTests(TestCase):
 	def test_frame_size(self):
@@ -26,4 +27,103 @@ class AutomatedTests(TestCase):
 		topleft_x, topleft_y = adjust_for_anchor(x, y, size_x, size_y, "bottom-right")
 
 		assert topleft_x == 3
-		assert topleft_y == 3
\ No newline at end of file
+		assert topleft_y == 3
+
+	def test_blend_rounds_exactly(self):
+		rng = np.random.default_rng(0)
+		for size in [(4, 5), (40, 50)]: # below and above SMALL_BLEND
+			original = rng.integers(0, 256, (*size, 3), dtype=np.uint8)
+			new = rng.integers(0, 256, (*size, 4), dtype=np.uint8)
+			alpha = new[..., 3:].astype(np.float64)
+			expected = np.floor((new[..., :3] * alpha + original * (255 - alpha)) / 255 + 0.5)
+
+			assert np.array_equal(blend_rgba_img_onto_rgb_img(original, new), expected)
+
+			new[..., 3] = np.where(new[..., 3] > 127, 255, 0) # only fully opaque or transparent pixels
+			assert np.array_equal(blend_rgba_img_onto_rgb_img(original, new), np.where(new[..., 3:] == 255, new[..., :3], original))
+
+	def test_blend_any_integer_dtype(self):
+		rng = np.random.default_rng(0)
+		original = rng.integers(0, 256, (40, 50, 3), dtype=np.uint8)
+		for size, alpha in [((4, 5), None), ((40, 50), 255), ((40, 50), 100), ((4, 5), 100)]: # rgb, opaque, partial, small
+			new = rng.integers(0, 256, (*size, 3 if alpha is None else 4)) # int64
+			if alpha is not None:
+				new[..., 3] = alpha
+			expected = blend_rgba_img_onto_rgb_img(original, new.astype(np.uint8))
+
+			assert np.array_equal(blend_rgba_img_onto_rgb_img(original, new), expected)
+
+		frame = PixeltermFrame((4, 4))
+		frame.add_image_from_pixels(np.full((4, 4, 4), 255), 0, 0)
+		assert (frame.pixels == 255).all()
+
+	def test_blend_out(self):
+		original = np.full((40, 40, 3), 10, dtype=np.uint8)
+		new = np.zeros((50, 30, 4), dtype=np.uint8) # clipped to the original's height
+		out = np.empty_like(original)
+
+		assert blend_rgba_img_onto_rgb_img(original, new, out=out) is out
+		assert (out == 10).all() # fully transparent
+
+		new[..., :3] = np.random.default_rng(0).integers(0, 256, (50, 30, 3))
+		new[..., 3] = 255 # fully opaque
+		blend_rgba_img_onto_rgb_img(original, new, out=original)
+		assert np.array_equal(original[:, :30], new[:40, :, :3]) and (original[:, 30:] == 10).all()
+
+	def test_add_rect(self):
+		frame = PixeltermFrame((10, 8))
+		frame.fill((100, 100, 100))
+
+		frame.add_rect((255, 0, 0), 2, 2, 3, 2, outline_width=1, outline_color=(0, 0, 255, 128))
+
+		assert (frame.pixels[2:4, 2:5] == (255, 0, 0)).all()
+		outline = np.zeros((8, 10), dtype=bool)
+		outline[1:5, 1:6] = True
+		outline[2:4, 2:5] = False
+		assert (frame.pixels[outline] == (50, 50, 178)).all() # (100 * 127 + 255 * 128) / 255 = 177.8
+		assert (frame.pixels[~outline & ~np.pad(np.ones((2, 3), bool), ((2, 4), (2, 5)))] == 100).all()
+
+	def test_add_rect_color_types(self):
+		frame = PixeltermFrame((6, 6))
+		frame.add_rect(np.array([10, 20, 30, 100]), 1, 1, 4, 4) # int64 channels
+		assert (frame.pixels[1:5, 1:5] == (4, 8, 12)).all()
+
+		frame.add_rect((255, 0, 0, 127.5), 0, 0, 2, 2) # alpha truncated to 127, same as a uint8 array would
+		assert (frame.pixels[0, 0] == (127, 0, 0)).all()
+
+	def test_add_rect_clipped(self):
+		frame = PixeltermFrame((10, 8))
+
+		frame.add_rect((0, 255, 0, 255), 8, 6, 5, 5) # hangs off the bottom right corner
+		frame.add_image_from_pixels(np.full((4, 4, 4), 255, dtype=np.uint8), -2, 6)
+
+		assert (frame.pixels[6:, 8:] == (0, 255, 0)).all()
+		assert (frame.pixels[6:, :2] == 255).all()
+		assert frame.pixels[:6].sum() == frame.pixels[:, 2:8].sum() == 0
+
+	def test_thick_line(self):
+		frame = PixeltermFrame((10, 8))
+
+		frame.add_line((2, 3), (5, 3), (255, 255, 255), width=2) # disks of radius 2 are 3x3 squares
+
+		drawn = np.zeros((8, 10), dtype=bool)
+		drawn[2:5, 1:7] = True
+		assert np.array_equal(frame.pixels.any(axis=-1), drawn)
+
+	def test_line_clipping(self):
+		frame = PixeltermFrame((10, 8))
+
+		frame.add_line((-5, 2), (3, 2), (255, 255, 255))
+		frame.add_line((0, -5), (9, -5), (255, 255, 255), width=3) # too far off the top to reach the frame
+
+		assert frame.pixels[2, :4].all() and frame.pixels.sum() == 4 * 3 * 255
+
+	def test_polyline(self):
+		points = [(1, 1), (8, 2), (4, 7)]
+		polyline, lines = PixeltermFrame((10, 8)), PixeltermFrame((10, 8))
+
+		polyline.add_polyline(points, (0, 255, 0), width=2, closed=True)
+		for start, end in zip(points, points[1:] + points[:1]):
+			lines.add_line(start, end, (0, 255, 0), width=2)
+
+		assert np.array_equal(polyline.pixels, lines.pixels)
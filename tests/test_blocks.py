@@ -0,0 +1,60 @@
+from unittest import TestCase
+import io
+import numpy as np
+from pixelterm import PixeltermFrame, OutputSink
+from pixelterm.blocks import CELL_GLYPHS, fit_cells
+
+class BlockTests(TestCase):
+	def test_glyph_tables(self):
+		assert CELL_GLYPHS["quadrant"][0b0110] == "▞"
+		assert CELL_GLYPHS["sextant"][0b000011] == "\U0001FB02" # top row
+		assert CELL_GLYPHS["sextant"][0b010101] == "▌"
+		assert CELL_GLYPHS["sextant"][0b111110] == "\U0001FB3B"
+		assert CELL_GLYPHS["braille"][0b10000001] == "⢁" # top left dot + bottom right dot
+		assert len(set(CELL_GLYPHS["braille"])) == 256
+
+	def test_fit_two_colors_exactly(self):
+		red, blue = (255, 0, 0), (0, 0, 255)
+		pixels = np.zeros((2, 4, 3), dtype=np.uint8)
+		pixels[:, :2] = [[red, blue], [blue, blue]] # one red pixel: red is the fg
+		pixels[:, 2:] = red # uniform
+
+		colors, masks = fit_cells(pixels, "quadrant")
+
+		assert masks.tolist() == [[0b0001, 0]]
+		assert colors[:, 0].tolist() == [list(red), list(blue)]
+		assert colors[:, 1].tolist() == [list(red), list(red)]
+
+	def test_fit_averages_groups(self):
+		pixels = np.array([[[0, 0, 0], [10, 10, 10]], [[200, 200, 200], [250, 250, 250]]], dtype=np.uint8)
+
+		colors, masks = fit_cells(pixels, "quadrant")
+
+		assert bin(masks[0, 0]).count("1") == 2
+		assert sorted(colors[:, 0, 0].tolist()) == [5, 225]
+
+	def test_render_quadrants(self):
+		red, blue = (255, 0, 0), (0, 0, 255)
+		frame = PixeltermFrame((4, 2), cell_mode="quadrant")
+		frame.pixels[:] = blue
+		frame.pixels[1, 0] = red
+		frame.pixels[:, 3] = red
+		target = io.BytesIO()
+
+		frame.render_raw(OutputSink(target))
+
+		# ▖ sets the colors, ▐ reuses them
+		assert target.getvalue().decode() == "\033[1;1H\033[38;2;255;0;0m\033[48;2;0;0;255m▖▐"
+
+		prev = frame.copy()
+		frame[0, 3] = blue
+		target.seek(0)
+		target.truncate()
+		frame.render(prev, OutputSink(target))
+
+		assert target.getvalue().decode() == "\033[1;2H\033[38;2;255;0;0m\033[48;2;0;0;255m▗"
+
+	def test_sizes_must_fit_cells(self):
+		self.assertRaises(AssertionError, PixeltermFrame, (5, 4), cell_mode="quadrant")
+		self.assertRaises(AssertionError, PixeltermFrame, (4, 6), (0, 2), cell_mode="sextant")
+		assert PixeltermFrame((4, 9), (2, 3), cell_mode="sextant").pixels.shape == (9, 4, 3)
@@ -0,0 +1,68 @@
+from unittest import TestCase
+import io, sys, threading
+import numpy as np
+from pixelterm import PixeltermFrame, OutputSink, ColorCodeCache, color_codes, fcode
+from pixelterm.color_cache import pack_colors
+
+class ColorCodeCacheTests(TestCase):
+	def test_hits_and_misses(self):
+		cache = ColorCodeCache()
+
+		assert cache.get((1, 2, 3)) == b"\033[38;2;1;2;3m"
+		assert cache.get((1, 2, 3), foreground=False) == b"\033[48;2;1;2;3m"
+		assert cache.get((1, 2, 3)) == b"\033[38;2;1;2;3m"
+
+		assert (cache.hits, cache.misses) == (1, 2)
+
+	def test_evicts_least_recently_used(self):
+		cache = ColorCodeCache(max_size=2)
+		cache.get((1, 1, 1))
+		cache.get((2, 2, 2))
+		cache.get((1, 1, 1)) # (2, 2, 2) is now the oldest
+		cache.get((3, 3, 3))
+
+		assert len(cache) == 2 and cache.evictions == 1
+		cache.get((1, 1, 1))
+		assert cache.misses == 3
+		cache.get((2, 2, 2))
+		assert cache.misses == 4
+
+	def test_thread_safe(self):
+		cache = ColorCodeCache(max_size=64)
+		errors = []
+		def lookups(seed):
+			try:
+				for value in np.random.default_rng(seed).integers(0, 256, 5000).tolist():
+					assert cache.get((value, 0, 0)) == f"\033[38;2;{value};0;0m".encode()
+			except Exception as e:
+				errors.append(e)
+
+		threads = [threading.Thread(target=lookups, args=(seed,)) for seed in range(8)]
+		interval = sys.getswitchinterval()
+		sys.setswitchinterval(1e-6) # switch threads as often as possible, so races actually happen
+		try:
+			for thread in threads:
+				thread.start()
+			for thread in threads:
+				thread.join()
+		finally:
+			sys.setswitchinterval(interval)
+
+		assert errors == [] and len(cache) == 64
+		assert cache.hits + cache.misses == 8 * 5000
+
+	def test_table(self):
+		cache = ColorCodeCache()
+		table, lengths = cache.table(pack_colors(np.array([[0, 0, 0], [255, 128, 7]], dtype=np.uint8)), False)
+
+		assert lengths.tolist() == [13, 17]
+		assert table[:lengths[1], 1].tobytes() == b"\033[48;2;255;128;7m"
+
+	def test_shared_by_fcode_and_render(self):
+		frame = PixeltermFrame((4, 4))
+		frame.fill((12, 34, 56))
+		frame.render_raw(OutputSink(io.BytesIO()))
+
+		hits = color_codes.hits
+		assert fcode((12, 34, 56), (12, 34, 56)) == "\033[38;2;12;34;56m\033[48;2;12;34;56m"
+		assert color_codes.hits >= hits + 1
@@ -0,0 +1,130 @@
+from unittest import TestCase
+import io
+import numpy as np
+from pixelterm import PixeltermFrame, OutputSink, Renderer
+from pixelterm.damage import add_damage, cell_rects, row_bands
+from pixelterm.encoder import changed_rows
+
+class DamageTests(TestCase):
+	def test_merge_overlapping(self):
+		rects = []
+		add_damage(rects, (0, 0, 2, 2))
+		add_damage(rects, (10, 10, 12, 12))
+		add_damage(rects, (1, 1, 4, 3)) # overlaps the first one
+
+		assert sorted(rects) == [(0, 0, 4, 3), (10, 10, 12, 12)]
+
+		# bridges both: everything becomes one rect
+		add_damage(rects, (3, 2, 11, 11))
+		assert rects == [(0, 0, 12, 12)]
+
+	def test_cell_rects(self):
+		# the pixel rows 1-2 are in character rows 0 and 1
+		assert cell_rects([(3, 1, 4, 3)], 2, 1) == [(3, 0, 4, 2)]
+
+	def test_drawing_records_damage(self):
+		frame = PixeltermFrame((20, 10))
+		assert frame.damage is None # not tracked until there's something to be relative to
+
+		frame.reset_damage(frame.copy())
+		frame.set_pixel(3, 4, (255, 0, 0))
+		frame[6:8, 10] = (0, 255, 0)
+		frame.add_rect((0, 0, 255), 15, 8, 10, 10) # goes off the frame
+		frame.add_line((0, 0), (2, 0), (1, 1, 1))
+
+		assert sorted(frame.damage) == [(0, 0, 3, 1), (3, 4, 4, 5), (10, 6, 11, 8), (15, 8, 20, 10)]
+
+	def test_render_only_diffs_damage(self):
+		frame = PixeltermFrame((20, 10))
+		prev = frame.copy()
+		frame.reset_damage(prev)
+		frame.set_pixel(3, 4, (255, 0, 0))
+		frame.pixels[0, 0] = (9, 9, 9) # not recorded, so not drawn
+		target = io.BytesIO()
+
+		painted = frame.render(prev, OutputSink(target))
+
+		assert target.getvalue() == b"\033[3;4H\033[38;2;255;0;0m\033[48;2;0;0;0m\xe2\x96\x80"
+		assert np.argwhere(painted).tolist() == [[2, 3]]
+
+		# ...unless marked
+		prev = frame.copy()
+		frame.reset_damage(prev)
+		frame.pixels[0, 0] = (8, 8, 8)
+		frame.mark_dirty((0, 0, 1, 1))
+		target.seek(0)
+		target.truncate()
+		frame.render(prev, OutputSink(target))
+		assert target.getvalue().startswith(b"\033[1;1H")
+
+	def test_drawing_on_previous_frame_falls_back_to_full_diff(self):
+		frame = PixeltermFrame((20, 10))
+		prev = frame.copy()
+		frame.reset_damage(prev)
+		prev.set_pixel(5, 5, (1, 2, 3))
+		target = io.BytesIO()
+
+		frame.render(prev, OutputSink(target))
+
+		assert target.getvalue() == b"\033[3;6H\033[48;2;0;0;0m "
+
+	def test_setitem_records_damage(self):
+		frame = PixeltermFrame((4, 4))
+		frame.reset_damage(frame.copy())
+
+		frame[1:3, 2, 0] = 200
+		assert frame.damage == [(2, 1, 3, 3)]
+		frame[..., 0] = 200 # not y and x, so the whole frame
+		assert frame.damage == [(0, 0, 4, 4)]
+
+	def test_set_pixel_negative_index(self):
+		frame = PixeltermFrame((4, 4))
+		prev = frame.copy()
+		frame.reset_damage(prev)
+
+		frame.set_pixel(-1, -1, (255, 255, 255))
+
+		assert frame.damage == [(3, 3, 4, 4)]
+		assert frame.encode(prev) != b""
+
+	def test_copy_doesnt_track_damage(self):
+		frame = PixeltermFrame((4, 4))
+		prev = frame.copy()
+		frame.pixels[:] = 50 # not marked, but damage isn't tracked, so it's still found
+
+		assert frame.damage is None
+		assert frame.encode(prev) != b""
+
+	def test_renderer_preserve_tracks_damage(self):
+		target = io.BytesIO()
+		renderer = Renderer((20, 10), sink=OutputSink(target), preserve=True)
+		renderer.present()
+
+		renderer.frame.set_pixel(1, 1, (255, 255, 255))
+		assert renderer.frame.damage == [(1, 1, 2, 2)]
+
+		target.seek(0)
+		target.truncate()
+		renderer.present()
+		assert target.getvalue() == "\033[1;2H\033[38;2;0;0;0m\033[48;2;255;255;255m▀".encode()
+		assert renderer.frame.damage == []
+
+	def test_changed_rows(self):
+		pixels = np.zeros((8, 5, 3), dtype=np.uint8)
+		prev = pixels.copy()
+		pixels[3, 4] = 1
+		pixels[6, 0] = 1
+
+		assert changed_rows(pixels, prev).tolist() == [False, True, False, True]
+		assert changed_rows(pixels, prev, 4).tolist() == [True, True]
+
+	def test_row_bands(self):
+		changed = np.zeros(30, dtype=bool)
+		assert row_bands(changed, 7) == []
+
+		changed[[2, 4, 5, 20]] = True # 2 and 4-5 are close enough to be one band
+		assert row_bands(changed, 7) == [(0, 2, 7, 6), (0, 20, 7, 21)]
+
+		# too many bands: one big band
+		changed[::5] = True
+		assert row_bands(changed, 7) == [(0, 0, 7, 26)]
@@ -0,0 +1,131 @@
+from unittest import TestCase
+import io
+import numpy as np
+from pixelterm import PixeltermFrame, OutputSink, fcode, move_xy
+from pixelterm.encoder import encode_raw, encode_cells, fill_cheap_gaps, dirty_cells, frame_colors, color_distance
+from pixelterm.palette import quantize
+
+def legacy_render_raw(pixels: np.ndarray, pos: tuple) -> bytes:
+	""" What `PixeltermFrame.render_raw` used to print, one fcode() call per pixel. """
+	out = ""
+	for i in range(0, pixels.shape[0], 2):
+		out += move_xy(pos[0], (i+pos[1])//2)
+		for j in range(pixels.shape[1]):
+			out += fcode(pixels[i,j], pixels[i+1,j]) + '▀'
+	return out.encode()
+
+class EncoderTests(TestCase):
+	def test_encode_raw_matches_legacy(self):
+		# when no two cells share a color, there's no state to reuse and every cell is a plain ▀
+		rng = np.random.default_rng(0)
+		pixels = rng.integers(0, 256, (10, 17, 3), dtype=np.uint8)
+		pixels[::2, 0] = (0, 5, 9) # some single-digit components
+		pixels[1::2, 0] = (255, 10, 99)
+
+		assert encode_raw(pixels, (3, 4)) == legacy_render_raw(pixels, (3, 4))
+
+	def test_encode_raw_large_coordinates(self):
+		pixels = np.full((4, 2, 3), 7, dtype=np.uint8)
+
+		assert encode_raw(pixels, (1500, 2000)) == b"\033[1001;1501H\033[48;2;7;7;7m  \033[1002;1501H  "
+
+	def test_encode_raw_empty(self):
+		assert encode_raw(np.zeros((0, 5, 3), dtype=np.uint8)) == b""
+
+	def test_encode_cells_only_emits_changed_colors(self):
+		pixels = np.zeros((4, 6, 3), dtype=np.uint8)
+		pixels[0::2] = (255, 0, 0) # every top half is red
+		pixels[1, ::2] = (0, 0, 255) # bottom halves alternate between blue and black
+		painted = np.ones((2, 6), dtype=bool)
+
+		encoded = encode_cells(pixels, painted)
+
+		# fg is set once for the whole frame, even across the row boundary
+		assert encoded.count(b"\033[38;2;") == 1
+		assert encoded.count(b"\033[48;2;") == 6 # the second row continues with black
+		assert encoded.count(b"H") == 2
+
+	def test_fill_cheap_gaps(self):
+		pixels = np.zeros((2, 100, 3), dtype=np.uint8)
+		dirty = np.zeros((1, 100), dtype=bool)
+		dirty[0, [0, 2, 99]] = True
+
+		painted = fill_cheap_gaps(pixels, dirty)
+
+		# repainting one cell is cheaper than a cursor move, repainting 96 of them isn't
+		assert painted[0, :3].all()
+		assert not painted[0, 3:99].any()
+		assert painted[0, 99]
+
+	def test_dirty_cells(self):
+		pixels = np.zeros((6, 5, 3), dtype=np.uint8)
+		prev = pixels.copy()
+		pixels[1, 2, 0] = 1 # bottom half of cell (0, 2)
+		pixels[4, 4, 2] = 1 # top half of cell (2, 4)
+
+		dirty = dirty_cells(pixels, prev)
+
+		assert dirty.shape == (3, 5)
+		assert sorted(zip(*np.nonzero(dirty))) == [(0, 2), (2, 4)]
+
+	def test_palette_quantization(self):
+		colors = np.array([[255, 0, 0], [10, 10, 10], [0, 0, 0], [250, 250, 250]], dtype=np.uint8)
+
+		assert list(quantize(colors, "256")) == [196, 232, 16, 231]
+		assert list(quantize(colors, "16")) == [9, 0, 0, 15]
+
+	def test_palette_mode_codes(self):
+		pixels = np.zeros((2, 2, 3), dtype=np.uint8)
+		pixels[0] = (255, 0, 0)
+
+		assert encode_raw(frame_colors(pixels, "256"), color_mode="256") == "\033[1;1H\033[38;5;196m\033[48;5;16m▀▀".encode()
+		assert encode_raw(frame_colors(pixels, "16"), color_mode="16") == "\033[1;1H\033[91m\033[40m▀▀".encode()
+
+	def test_palette_mode_diffs_on_indices(self):
+		frame = PixeltermFrame((4, 4), color_mode="256")
+		frame.fill((100, 100, 100))
+		noisy = frame.copy()
+		noisy.pixels[1, 1] = (101, 99, 100) # quantizes to the same gray
+		target = io.BytesIO()
+
+		noisy.render(frame, OutputSink(target))
+
+		assert target.getvalue() == b""
+
+	def test_perceptual_distance(self):
+		gray = np.array([100, 100, 100])
+
+		assert round(float(color_distance(gray + 5, gray, "perceptual"))) == 5
+		assert color_distance(np.array([100, 110, 100]), gray, "perceptual") > color_distance(np.array([100, 100, 110]), gray, "perceptual")
+
+	def test_glyph_choice(self):
+		red, blue = (255, 0, 0), (0, 0, 255)
+		pixels = np.zeros((2, 5, 3), dtype=np.uint8)
+		pixels[0] = [red, red, blue, blue, red] # top halves
+		pixels[1] = [blue, red, blue, red, red] # bottom halves
+
+		encoded = encode_raw(pixels).decode()
+
+		# ▀ sets fg red/bg blue, and every cell after it reuses those two colors
+		assert encoded == "\033[1;1H\033[38;2;255;0;0m\033[48;2;0;0;255m▀█ ▄█"
+
+	def test_encode_raw_many_colors(self):
+		# more distinct colors than the code cache holds are encoded without it, with the same result
+		pixels = np.random.default_rng(1).integers(0, 256, (100, 60, 3), dtype=np.uint8)
+
+		assert encode_raw(pixels) == legacy_render_raw(pixels, (0, 0))
+
+	def test_frame_encode_matches_render(self):
+		rng = np.random.default_rng(2)
+		prev = PixeltermFrame((8, 6), (3, 4))
+		prev.pixels[:] = rng.integers(0, 256, prev.pixels.shape, dtype=np.uint8)
+		frame = prev.copy()
+		frame[2:4, 1:5] = (255, 255, 255)
+		raw_target, diff_target = io.BytesIO(), io.BytesIO()
+
+		frame.render_raw(OutputSink(raw_target))
+		frame.render(prev, OutputSink(diff_target))
+
+		assert frame.encode_raw() == frame.encode() == raw_target.getvalue()
+		assert frame.encode(prev) == diff_target.getvalue() != b""
+		assert prev.encode(prev.copy()) == b""
@@ -0,0 +1,44 @@
+from unittest import TestCase
+import numpy as np
+from pixelterm import PixeltermFrame, gradient_image
+
+class GradientTests(TestCase):
+	def test_fill_with_gradient_matches_linspace(self):
+		frame = PixeltermFrame((7, 4))
+
+		frame.fill_with_gradient((0, 0, 0), (255, 100, 3))
+		assert (frame.pixels == np.linspace((0, 0, 0), (255, 100, 3), 7).astype(np.uint8)).all()
+
+		frame.fill_with_gradient((0, 0, 0), (255, 100, 3), "vertical")
+		assert (frame.pixels == np.linspace((0, 0, 0), (255, 100, 3), 4).astype(np.uint8)[:, np.newaxis]).all()
+
+	def test_multi_stop(self):
+		image = gradient_image(5, 1, [(0, 0, 0), (200, 0, 0), (0, 0, 200)], positions=(0, 0.25, 1))
+
+		assert image[0, :, 0].tolist() == [0, 200, 133, 66, 0]
+		assert image[0, :, 2].tolist() == [0, 0, 66, 133, 200]
+
+	def test_diagonal_and_radial(self):
+		colors = [(255, 255, 255), (0, 0, 0)]
+		diagonal = gradient_image(5, 3, colors, "diagonal")
+		radial = gradient_image(5, 3, colors, "radial")
+
+		assert diagonal[0, 0].tolist() == [255] * 3 and diagonal[2, 4].tolist() == [0] * 3
+		assert (diagonal[0, 4] == diagonal[2, 0]).all() # same distance along the diagonal
+		assert radial[1, 2].tolist() == [255] * 3 # center
+		assert (radial[[0, 0, 2, 2], [0, 4, 0, 4]] == 0).all() # corners
+
+	def test_cached(self):
+		image = gradient_image(9, 9, [(1, 2, 3), (4, 5, 6)], "radial")
+
+		assert gradient_image(9, 9, [(1, 2, 3), (4, 5, 6)], "radial") is image
+		assert not image.flags.writeable
+
+	def test_add_gradient_clipped(self):
+		frame = PixeltermFrame((10, 6))
+		colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
+
+		frame.add_gradient(colors, 10, 6, 8, 4, "diagonal", anchor="center") # the top left quarter is on the frame
+
+		assert (frame.pixels[4:, 6:] == gradient_image(8, 4, colors, "diagonal")[:2, :4]).all()
+		assert frame.pixels[:4].sum() == frame.pixels[:, :6].sum() == 0
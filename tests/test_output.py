@@ -0,0 +1,116 @@
+from unittest import TestCase
+import io, os, threading
+from pixelterm import PixeltermFrame, OutputSink, ThreadedSink
+from pixelterm.encoder import encode_raw
+
+class TrickleWriter:
+	""" Binary target that only accepts 3 bytes per write() call. """
+	def __init__(self):
+		self.received = b""
+
+	def write(self, data) -> int:
+		self.received += bytes(data[:3])
+		return min(3, len(data))
+
+class OutputSinkTests(TestCase):
+	def test_render_raw_to_bytes_buffer(self):
+		frame = PixeltermFrame((4, 4))
+		frame.fill((10, 20, 30))
+		target = io.BytesIO()
+
+		frame.render_raw(OutputSink(target))
+
+		assert target.getvalue() == encode_raw(frame.pixels)
+
+	def test_partial_writes(self):
+		target = TrickleWriter()
+		sink = OutputSink(target, buffer_size=4)
+
+		sink.write(b"hello ")
+		sink.write(b"world")
+		assert target.received == b""
+
+		sink.flush()
+		assert target.received == b"hello world"
+
+		# buffer is reused after flushing
+		sink.send(b"again")
+		assert target.received == b"hello worldagain"
+
+	def test_file_descriptor(self):
+		read_fd, write_fd = os.pipe()
+		try:
+			OutputSink(write_fd).send(b"\033[1;1H")
+			assert os.read(read_fd, 100) == b"\033[1;1H"
+		finally:
+			os.close(read_fd)
+			os.close(write_fd)
+
+	def test_text_stream(self):
+		target = io.StringIO()
+		OutputSink(target).send("▀".encode())
+
+		assert target.getvalue() == "▀"
+
+	def test_synchronized_update(self):
+		target = io.BytesIO()
+		sink = OutputSink(target)
+
+		sink.send(b"frame", synchronized=True)
+		sink.send(b"", synchronized=True) # nothing to show, nothing written
+
+		assert target.getvalue() == b"\033[?2026hframe\033[?2026l"
+
+class SlowWriter:
+	""" Binary target that blocks on every write until released. """
+	def __init__(self):
+		self.received = []
+		self.release = threading.Event()
+
+	def write(self, data) -> int:
+		self.release.wait()
+		self.received.append(bytes(data))
+		return len(data)
+
+class ThreadedSinkTests(TestCase):
+	def test_writes_in_order(self):
+		target = io.BytesIO()
+		with ThreadedSink(target) as sink:
+			for i in range(10):
+				sink.send(str(i).encode())
+
+		assert target.getvalue() == b"0123456789"
+
+	def test_coalesce(self):
+		target = SlowWriter()
+		sink = ThreadedSink(target, max_pending=1, policy="coalesce")
+
+		sink.send(b"a") # picked up by the writer thread, which then blocks
+		while sink._queue.qsize(): pass
+		sink.send(b"b") # pending
+		sink.send(b"c") # queue full, merged with b
+
+		target.release.set()
+		sink.close()
+		assert target.received == [b"a", b"bc"]
+		assert sink.frames_coalesced == 1
+
+	def test_drop_requests_full_redraw(self):
+		target = SlowWriter()
+		sink = ThreadedSink(target, max_pending=1, policy="drop")
+		frame = PixeltermFrame((2, 2))
+
+		sink.send(b"a")
+		while sink._queue.qsize(): pass
+		sink.send(b"b")
+		sink.send(b"c") # queue full, b and c are dropped
+		assert sink.resync_needed
+		assert sink.frames_dropped == 2
+
+		# even with a previous frame, the next render is a full redraw
+		frame.render(frame.copy(), sink)
+		assert not sink.resync_needed
+
+		target.release.set()
+		sink.close()
+		assert target.received == [b"a", encode_raw(frame.pixels)]
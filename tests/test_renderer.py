@@ -0,0 +1,157 @@
+from unittest import TestCase
+import io
+import numpy as np
+from pixelterm import Renderer, OutputSink, VirtualTerminal
+from pixelterm.encoder import encode_raw
+
+class RendererTests(TestCase):
+	def test_present_diffs_against_front_buffer(self):
+		target = io.BytesIO()
+		renderer = Renderer((8, 6), sink=OutputSink(target))
+
+		renderer.frame.fill((1, 2, 3))
+		renderer.present()
+		assert target.getvalue() == encode_raw(renderer.front.pixels)
+
+		# same picture again: nothing to write
+		target.seek(0)
+		target.truncate()
+		renderer.frame.fill((1, 2, 3))
+		renderer.present()
+		assert target.getvalue() == b""
+
+	def test_buffers_are_reused(self):
+		renderer = Renderer((8, 6), sink=OutputSink(io.BytesIO()))
+		buffers = {id(renderer.front.pixels), id(renderer.back.pixels)}
+
+		for i in range(5):
+			renderer.frame.set_pixel(i, i, (255, 255, 255))
+			renderer.present()
+
+		assert {id(renderer.front.pixels), id(renderer.back.pixels)} == buffers
+
+	def test_back_buffer_modes(self):
+		cleared = Renderer((4, 4), sink=OutputSink(io.BytesIO()))
+		cleared.frame.fill((9, 9, 9))
+		cleared.present()
+		assert not cleared.frame.pixels.any()
+
+		preserved = Renderer((4, 4), sink=OutputSink(io.BytesIO()), preserve=True)
+		preserved.frame.fill((9, 9, 9))
+		preserved.present()
+		assert np.array_equal(preserved.frame.pixels, preserved.front.pixels)
+
+	def test_tolerance_tracks_displayed_frame(self):
+		target = io.BytesIO()
+		renderer = Renderer((4, 4), sink=OutputSink(target), preserve=True, tolerance=3)
+		renderer.frame.fill((100, 100, 100))
+		renderer.present()
+
+		# creep up by 1 each frame: small steps get skipped, but never drift more than `tolerance` from the screen
+		redraws = 0
+		for value in range(101, 111):
+			target.seek(0)
+			target.truncate()
+			renderer.frame.fill((value, 100, 100))
+			renderer.present()
+
+			redraws += target.getvalue() != b""
+			assert np.abs(renderer.front.pixels.astype(int) - renderer.back.pixels).max() <= 3
+
+		assert 0 < redraws < 10
+
+	def test_byte_budget_converges(self):
+		target = io.BytesIO()
+		renderer = Renderer((20, 10), sink=OutputSink(target), preserve=True, max_bytes=600)
+		renderer.present()
+
+		# scene change: everything is different, and the worst part is in the middle
+		scene = np.random.default_rng(0).integers(0, 100, (10, 20, 3), dtype=np.uint8)
+		scene[4:6, 8:12] = 255
+
+		sizes = []
+		for _ in range(20):
+			target.seek(0)
+			target.truncate()
+			renderer.frame.pixels[:] = scene
+			renderer.present()
+			sizes.append(len(target.getvalue()))
+
+			if len(sizes) == 1:
+				# the most visibly wrong cells go first
+				assert np.array_equal(renderer.front.pixels[4:6, 8:12], scene[4:6, 8:12])
+
+		assert max(sizes) <= 600
+		assert sizes[-1] == 0
+		assert np.array_equal(renderer.front.pixels, scene)
+
+	def test_tiny_byte_budget_converges(self):
+		target = io.BytesIO()
+		renderer = Renderer((40, 20), sink=OutputSink(target), preserve=True, max_bytes=30) # less than a single cell costs
+		renderer.present()
+		scene = np.random.default_rng(0).integers(0, 256, (20, 40, 3), dtype=np.uint8)
+
+		frames = 0
+		while frames == 0 or target.getvalue() != b"":
+			target.seek(0)
+			target.truncate()
+			renderer.frame.pixels[:] = scene
+			renderer.present()
+			frames += 1
+			assert frames <= 401 # one cell per frame
+
+		assert np.array_equal(renderer.front.pixels, scene)
+
+	def test_scroll_with_preserve(self):
+		target = io.BytesIO()
+		renderer = Renderer((40, 40), sink=OutputSink(target), preserve=True, scroll=True)
+		content = np.random.default_rng(0).integers(0, 256, (44, 40, 3), dtype=np.uint8)
+		renderer.frame.pixels[:] = content[:40]
+		renderer.frame.mark_dirty()
+		renderer.present()
+		terminal = VirtualTerminal(40, 20)
+		terminal.feed(target.getvalue())
+
+		# the back buffer tracks its damage, that mustn't keep the scroll from being found
+		target.seek(0)
+		target.truncate()
+		renderer.frame.pixels[:] = content[4:]
+		renderer.frame.mark_dirty()
+		renderer.present()
+		terminal.feed(target.getvalue())
+
+		assert b"\033[2S" in target.getvalue() and len(target.getvalue()) < 5000
+		assert np.array_equal(terminal.pixels(), content[4:])
+
+	def test_render_stats(self):
+		reports = []
+		target = io.BytesIO()
+		renderer = Renderer((8, 6), sink=OutputSink(target), on_stats=reports.append, stats_history=2)
+
+		renderer.frame.fill((1, 2, 3))
+		renderer.present()
+		renderer.frame.fill((1, 2, 3))
+		renderer.frame.set_pixel(5, 3, (255, 255, 255))
+		renderer.present()
+		renderer.frame.fill((1, 2, 3))
+		renderer.frame.set_pixel(5, 3, (255, 255, 255))
+		renderer.present()
+
+		assert len(reports) == 3 and list(renderer.stats) == reports[1:]
+		full, diff, idle = reports
+		assert full.full_redraw and full.cells_painted == 24 and full.sgr_codes == 1 and full.cursor_moves == 3
+		assert not diff.full_redraw and diff.cells_painted == 1 and diff.cursor_moves == 1
+		assert idle.bytes_written == idle.cells_painted == 0
+		assert full.bytes_written + diff.bytes_written == len(target.getvalue())
+		assert diff.total_time >= diff.diff_time > 0
+
+	def test_stats_hud(self):
+		renderer = Renderer((80, 20), sink=OutputSink(io.BytesIO()), clear_color=(0, 0, 255), hud=True)
+
+		renderer.frame.fill((0, 0, 255))
+		renderer.present()
+		assert (renderer.front.pixels == (0, 0, 255)).all() # no stats yet, nothing to show
+		renderer.present() # the back buffer got cleared to blue
+
+		assert renderer.stats.maxlen == 60
+		assert (renderer.front.pixels[1:10, 1:40] != (0, 0, 255)).any(axis=-1).all(axis=1).any() # a row of the overlay's background
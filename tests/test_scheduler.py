@@ -0,0 +1,42 @@
+from unittest import TestCase
+from time import sleep, perf_counter
+from pixelterm import FrameScheduler
+
+class FrameSchedulerTests(TestCase):
+	def test_paces_frames(self):
+		scheduler = FrameScheduler(200, max_frames=10)
+		start = perf_counter()
+
+		assert list(scheduler) == list(range(10))
+
+		# frame 9 is due 45ms after frame 0
+		assert perf_counter() - start >= 9 / 200
+		assert scheduler.frames_dropped == 0
+
+	def test_drops_late_frames(self):
+		reports = []
+		scheduler = FrameScheduler(100, max_frames=20, on_report=reports.append)
+
+		frame_numbers = []
+		for frame_number in scheduler:
+			frame_numbers.append(frame_number)
+			if frame_number == 2:
+				sleep(0.05) # takes 5 frame intervals
+
+		assert 3 not in frame_numbers and 4 not in frame_numbers
+		assert frame_numbers[-1] == 19
+		assert scheduler.frames_dropped >= 3
+		assert scheduler.deadline_misses >= 1
+		assert reports[2].missed_deadlines >= 4
+		assert scheduler.frames_presented == len(frame_numbers) == len(reports)
+
+	def test_no_dropping(self):
+		scheduler = FrameScheduler(100, max_frames=6, drop_frames=False)
+		frame_numbers = []
+		for frame_number in scheduler:
+			frame_numbers.append(frame_number)
+			if frame_number == 1:
+				sleep(0.03)
+
+		assert frame_numbers == list(range(6))
+		assert scheduler.frames_dropped == 0
@@ -0,0 +1,37 @@
+from unittest import TestCase
+import io
+import numpy as np
+from pixelterm import PixeltermFrame, OutputSink
+from pixelterm.scroll import detect_scroll, exposed_rows, shift_rows
+
+class ScrollTests(TestCase):
+	def test_detect_scroll(self):
+		prev = np.arange(10)
+
+		assert detect_scroll(np.arange(10), prev) is None
+		# moved up by 2, with 2 new rows at the bottom
+		assert detect_scroll(np.array([2, 3, 4, 5, 6, 7, 8, 9, 20, 21]), prev) == (0, 10, 2)
+		# a static header, the rest moved down by 1
+		assert detect_scroll(np.array([0, 30, 1, 2, 3, 4, 5, 6, 7, 8]), prev) == (1, 10, -1)
+		assert exposed_rows(1, 10, -1) == (1, 2)
+
+	def test_shift_rows(self):
+		pixels = np.repeat(np.arange(6, dtype=np.uint8), 2)[:, np.newaxis, np.newaxis]
+
+		shifted = shift_rows(pixels, 1, 5, 2)
+
+		assert shifted[::2, 0, 0].tolist() == [0, 3, 4, 3, 4, 5] # rows 3 and 4 are exposed, left as they were
+
+	def test_render_scrolls(self):
+		rng = np.random.default_rng(0)
+		content = rng.integers(0, 256, (24, 6, 3), dtype=np.uint8)
+		prev = PixeltermFrame((6, 20))
+		prev.pixels[:] = content[:20]
+		frame = PixeltermFrame((6, 20))
+		frame.pixels[:] = content[4:] # scrolled up by 2 rows
+		target = io.BytesIO()
+
+		painted = frame.render(prev, OutputSink(target), scroll=True)
+
+		assert target.getvalue().startswith(b"\033[1;10r\033[2S\033[r")
+		assert np.flatnonzero(painted.any(axis=1)).tolist() == [8, 9] # only the new rows are drawn
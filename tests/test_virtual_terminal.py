@@ -0,0 +1,92 @@
+from unittest import TestCase
+import numpy as np
+from pixelterm import PixeltermFrame, VirtualTerminal
+from pixelterm.blocks import CELL_SHAPES
+from pixelterm.palette import palette_of, quantize
+
+def random_frames(count, size, seed=0, **kwargs):
+	""" Frames that change a bit from one to the next: random rects of random colors. """
+	rng = np.random.default_rng(seed)
+	frame = PixeltermFrame(size, **kwargs)
+	frame.pixels[:] = rng.integers(0, 256, frame.pixels.shape, dtype=np.uint8)
+	frames = [frame]
+	for _ in range(count - 1):
+		frame = frame.copy()
+		x, y = rng.integers(0, size[0]), rng.integers(0, size[1])
+		frame[y:y + rng.integers(1, 8), x:x + rng.integers(1, 8)] = tuple(rng.integers(0, 256, 3).tolist())
+		frames.append(frame)
+	return frames
+
+class VirtualTerminalTests(TestCase):
+	def test_feed(self):
+		terminal = VirtualTerminal(4, 2)
+
+		terminal.feed(b"\033[2;2H\033[38;2;1;2;3m\033[44m\xe2\x96\x80a\033[0mb")
+
+		assert terminal.chars.tolist() == [[" "] * 4, [" ", "▀", "a", "b"]]
+		assert terminal.fg[1, 1].tolist() == [1, 2, 3]
+		assert terminal.bg[1, 2].tolist() == [0, 0, 238] # 44 is ANSI blue
+		assert terminal.bg[1, 3].tolist() == [0, 0, 0]
+		assert terminal.bytes_fed == 33
+
+	def test_rejects_unknown_codes(self):
+		terminal = VirtualTerminal(4, 2)
+
+		self.assertRaises(ValueError, terminal.feed, "\033[2J")
+		terminal.forget_colors()
+		self.assertRaises(ValueError, terminal.feed, "x") # printed with no color set
+
+	def test_scroll_region(self):
+		terminal = VirtualTerminal(1, 4)
+		terminal.feed("a\r\nb\r\nc\r\nd")
+
+		terminal.feed("\033[2;4r\033[1S\033[r")
+
+		assert terminal.chars[:, 0].tolist() == ["a", "c", "d", " "]
+
+	def test_render_reproduces_frames(self):
+		for color_mode in ["truecolor", "256"]:
+			frames = random_frames(12, (20, 16), color_mode=color_mode)
+			terminal = VirtualTerminal(20, 8)
+			terminal.feed(frames[0].encode_raw())
+
+			for prev, frame in zip(frames, frames[1:]):
+				terminal.forget_colors()
+				terminal.feed(frame.encode(prev))
+
+				expected = frame.pixels if color_mode == "truecolor" else palette_of(color_mode)[quantize(frame.pixels, color_mode)]
+				assert np.array_equal(terminal.pixels(), expected), f"{color_mode} frames differ"
+
+	def test_render_reproduces_cell_modes(self):
+		# cells of at most two colors are fitted exactly, so they have to come back unchanged
+		rng = np.random.default_rng(1)
+		colors = rng.integers(0, 256, (2, 3), dtype=np.uint8)
+		for cell_mode in ["quadrant", "sextant", "braille"]:
+			prev = PixeltermFrame((12, 12), cell_mode=cell_mode)
+			prev.pixels[:] = colors[rng.integers(0, 2, prev.pixels.shape[:2])]
+			frame = prev.copy()
+			frame[4:8, 2:6] = tuple(colors[0].tolist())
+			cell_height, cell_width = CELL_SHAPES[cell_mode]
+			terminal = VirtualTerminal(12 // cell_width, 12 // cell_height)
+
+			terminal.feed(prev.encode_raw())
+			terminal.forget_colors()
+			terminal.feed(frame.encode(prev))
+
+			assert np.array_equal(terminal.pixels(cell_mode), frame.pixels), f"{cell_mode} frames differ"
+
+	def test_render_reproduces_scrolling(self):
+		rng = np.random.default_rng(2)
+		content = rng.integers(0, 256, (30, 8, 3), dtype=np.uint8)
+		prev = PixeltermFrame((8, 20))
+		prev.pixels[:] = content[:20]
+		frame = PixeltermFrame((8, 20))
+		frame.pixels[:] = content[6:26]
+		terminal = VirtualTerminal(8, 10)
+		terminal.feed(prev.encode_raw())
+
+		encoded = frame.encode(prev, scroll=True)
+		terminal.feed(encoded)
+
+		assert np.array_equal(terminal.pixels(), frame.pixels)
+		assert len(encoded) < len(frame.encode(prev)) # scrolling sends less than redrawing the rows